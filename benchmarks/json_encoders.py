@@ -0,0 +1,62 @@
+"""
+Compare the JSON encoders of callback responses: plotly's json and orjson engines, and 'to_json_orjson'.
+
+    pip install dash-dashy[fast]
+    python benchmarks/json_encoders.py
+"""
+import json
+import timeit
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+from plotly.io.json import to_json_plotly
+
+from dashy.serialization import to_json_orjson
+
+
+def large_figure(n: int = 200_000):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "x": rng.normal(size=n),
+            "y": rng.normal(size=n),
+            "group": rng.choice(["a", "b", "c"], size=n),
+        }
+    )
+    return px.scatter(df, x="x", y="y", color="group")
+
+
+def large_records(n: int = 20_000):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "id": np.arange(n),
+            "value": rng.normal(size=n),
+            "name": rng.choice(["alpha", "beta", "gamma"], size=n),
+            "date": pd.date_range("2021-01-01", periods=n, freq="min"),
+        }
+    )
+    return df.to_dict("records")
+
+
+ENCODERS = {
+    "plotly json": lambda value: to_json_plotly(value, engine="json"),
+    "plotly orjson": lambda value: to_json_plotly(value, engine="orjson"),
+    "to_json_orjson": to_json_orjson,
+}
+
+
+def bench(name: str, value, number: int = 5):
+    # the same JSON must come out of all encoders
+    expected = json.loads(to_json_plotly(value, engine="json"))
+    print(name)
+    for label, encoder in ENCODERS.items():
+        assert json.loads(encoder(value)) == expected, label
+        seconds = min(timeit.repeat(lambda: encoder(value), number=1, repeat=number))
+        print(f"  {label:<16}{seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    bench("figure, 200k points", large_figure())
+    bench("records, 20k rows", large_records())
@@ -1,6 +1,5 @@
 import dashy
 import dashy.components as dc
-from dash.exceptions import PreventUpdate
 
 
 layout = [
@@ -9,12 +8,20 @@ layout = [
 ]
 app = dashy.create_app(__name__, layout=layout)
 
-
-@app.cb(("button", "n_clicks"), ("modal", "is_open"), ("modal", "is_open"))
-def toggle_modal(clicks, is_open):
-    if clicks == 0:
-        raise PreventUpdate
-    return not is_open
+# toggle the modal in the browser, no request is sent to the server
+app.cb(
+    ("button", "n_clicks"),
+    ("modal", "is_open"),
+    ("modal", "is_open"),
+    clientside="""
+    function(clicks, is_open) {
+        if (!clicks) {
+            return window.dash_clientside.no_update;
+        }
+        return !is_open;
+    }
+    """,
+)
 
 
 if __name__ == "__main__":
@@ -1 +1,50 @@
-from dashy.dashy import *
+import importlib
+
+# public name -> module defining it. Most of them import dash, so they are only imported on first use to keep
+# 'import dashy' fast.
+_LAZY = {
+    "create_app": "dashy.dashy",
+    "DashyApp": "dashy.dashy",
+    "CallbackCache": "dashy.cache",
+    "SingleFlight": "dashy.cache",
+    "CallbackMetrics": "dashy.metrics",
+    "DatasetRegistry": "dashy.datasets",
+    "Theme": "dashy.themes",
+    "use_json_engine": "dashy.serialization",
+    "is_cancelled": "dashy.cancel",
+    "raise_if_cancelled": "dashy.cancel",
+    "Patch": "dashy.patches",
+    "figure_patch": "dashy.patches",
+    "table_patch": "dashy.patches",
+    # re-exported for 'from dashy import *'
+    "dash": "dashy.dashy",
+    "html": "dashy.dashy",
+    "dcc": "dashy.dashy",
+    "Input": "dashy.dashy",
+    "Output": "dashy.dashy",
+    "State": "dashy.dashy",
+    "logger": "dashy.dashy",
+}
+
+# public name -> module re-exported under that name
+_LAZY_MODULES = {
+    "go": "plotly.graph_objs",
+}
+
+__all__ = [*_LAZY, *_LAZY_MODULES]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_MODULES:
+        value = importlib.import_module(_LAZY_MODULES[name])
+    elif name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,56 @@
+import asyncio
+import contextvars
+import threading
+from functools import wraps
+from typing import Any, Callable, Coroutine, Optional
+
+
+class EventLoopThread:
+    """
+    An asyncio event loop running in a daemon thread, shared by all async callbacks of an app.
+    The loop is started the first time a coroutine is run.
+    """
+
+    def __init__(self, name: str = "dashy-event-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, name=self.name, daemon=True
+                ).start()
+            return self._loop
+
+    def run(self, coro: Coroutine) -> Any:
+        """Run 'coro' on the loop and block until it is done"""
+        context = contextvars.copy_context()
+        return asyncio.run_coroutine_threadsafe(
+            _in_context(context, coro), self.loop
+        ).result()
+
+    def wrap(self, func: Callable[..., Coroutine]) -> Callable:
+        """Wrap an async function into a regular function running it on the loop"""
+
+        @wraps(func)
+        def run_async(*args, **kwargs):
+            return self.run(func(*args, **kwargs))
+
+        return run_async
+
+    def stop(self):
+        with self._lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop = None
+
+
+async def _in_context(context: contextvars.Context, coro: Coroutine) -> Any:
+    # the task gets a copy of the loop thread's context, restore the one of the caller e.g. the cancel token
+    for var, value in context.items():
+        var.set(value)
+    return await coro
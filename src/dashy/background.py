@@ -0,0 +1,128 @@
+import contextvars
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import wraps
+from typing import Any, Callable, Optional
+
+from dashy.cancel import CancelToken, cancel_scope
+
+
+class BackgroundJob:
+    """A callback execution running on a worker thread"""
+
+    def __init__(self, job_id: str):
+        self.id = job_id
+        self.future: Optional[Future] = None
+        self.progress: Any = None
+        self.cancel_token = CancelToken()
+        self.finished_at: Optional[float] = None
+
+    def run(self, func: Callable, *args) -> Any:
+        reset = _current_job.set(self)
+        try:
+            with cancel_scope(self.cancel_token):
+                return func(*args)
+        finally:
+            _current_job.reset(reset)
+            self.finished_at = time.monotonic()
+
+    def set_progress(self, value: Any):
+        self.progress = value
+
+    def done(self) -> bool:
+        return self.future is not None and self.future.done()
+
+
+_current_job: contextvars.ContextVar[Optional[BackgroundJob]] = contextvars.ContextVar(
+    "dashy_background_job", default=None
+)
+
+
+def set_progress(value: Any):
+    """
+    Report the progress of the current background callback execution, e.g. the value of a progress bar.
+    Does nothing outside of a background callback.
+    """
+    job = _current_job.get()
+    if job is not None:
+        job.set_progress(value)
+
+
+def with_progress(func: Callable) -> Callable:
+    """Wrap 'func' to be passed 'set_progress' as its first argument"""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return func(set_progress, *args, **kwargs)
+
+    return wrapper
+
+
+class BackgroundRunner:
+    """
+    Runs callbacks on a thread pool and keeps track of the submitted jobs until their result is collected.
+
+    Args:
+        max_workers: Max number of executions running at the same time, further executions are queued.
+        name: Name used for the worker threads
+        ttl: Seconds a finished job is kept if its result is not collected, e.g. because the page was closed
+    """
+
+    def __init__(self, max_workers: int = 4, name: str = "dashy", ttl: float = 600):
+        if max_workers < 1:
+            raise ValueError("'max_workers' must be at least 1")
+        self.ttl = ttl
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"{name}-bg"
+        )
+        self._jobs: dict[str, BackgroundJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable, *args) -> BackgroundJob:
+        """
+        Submit 'func' to the pool.
+
+        Args:
+            func: Function to run
+            args: Arguments passed to 'func'
+
+        Returns:
+            The submitted job
+        """
+        job = BackgroundJob(uuid.uuid4().hex)
+        with self._lock:
+            self._remove_expired()
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(job.run, func, *args)
+        return job
+
+    def get(self, job_id: Optional[str]) -> Optional[BackgroundJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def discard(self, job_id: Optional[str]) -> Optional[BackgroundJob]:
+        """
+        Stop tracking a job. It is cancelled if it has not started yet, otherwise its cancel token is set so the
+        callback can stop early.
+        """
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+        if job is not None and job.future is not None and not job.future.cancel():
+            job.cancel_token.cancel()
+        return job
+
+    def _remove_expired(self):
+        horizon = time.monotonic() - self.ttl
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < horizon
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,254 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import wraps
+from typing import Any, Callable, Hashable, Optional
+
+from dashy.cancel import is_cancelled
+
+
+_MISSING = object()
+_CANCELLED = object()
+
+
+def freeze(value: Any) -> Hashable:
+    """Convert callback arguments (json like lists and dicts) into a hashable key"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(freeze(v) for v in value)
+    return value
+
+
+class CallbackCache:
+    """
+    Memoizing cache for callback results with LRU and TTL eviction.
+
+    Identical input/state tuples will return the stored result instead of running the callback again.
+
+    Args:
+        max_entries: Max number of results to keep, the least recently used is evicted first.
+        ttl: Time to live in seconds for a result. If None results never expire.
+        key: Function taking the same arguments as the callback and returning a hashable key.
+             If None the key is built from all arguments.
+        max_size: Max total size of the results, measured by 'sizeof'. The least recently used are evicted first,
+                  a single result larger than this is not stored. If None only 'max_entries' applies.
+        sizeof: Function returning the size of a result, e.g. in bytes. Required with 'max_size'.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl: Optional[float] = None,
+        key: Optional[Callable[..., Hashable]] = None,
+        max_size: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+    ):
+        if max_entries < 1:
+            raise ValueError("'max_entries' must be at least 1")
+        if max_size is not None and sizeof is None:
+            raise ValueError("'sizeof' must be passed together with 'max_size'")
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.key = key
+        self.max_size = max_size
+        self.sizeof = sizeof
+        self.size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def make_key(self, *args, **kwargs) -> Hashable:
+        if self.key is not None:
+            return self.key(*args, **kwargs)
+        return freeze((args, kwargs))
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value, _size = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+
+                # expired
+                self._remove(key)
+                self.evictions += 1
+
+            self.misses += 1
+            return default
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Look up a value like 'get', without counting a hit or miss and without marking it as recently used"""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        expires_at, value, _size = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any) -> bool:
+        """
+        Store a value.
+
+        Returns:
+            False if the value is larger than 'max_size' and was not stored
+        """
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        size = self.sizeof(value) if self.sizeof is not None else 0
+        if self.max_size is not None and size > self.max_size:
+            return False
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, value, size)
+            self.size += size
+            while len(self._entries) > self.max_entries or (
+                self.max_size is not None and self.size > self.max_size
+            ):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return True
+
+    def _remove(self, key: Hashable):
+        _expires_at, _value, size = self._entries.pop(key)
+        self.size -= size
+
+    def invalidate(self, *args, **kwargs) -> bool:
+        """
+        Remove the result stored for the passed callback arguments.
+
+        Returns:
+            True if a result was removed
+        """
+        return self.delete(self.make_key(*args, **kwargs))
+
+    def delete(self, key: Hashable) -> bool:
+        """
+        Remove the result stored under 'key'.
+
+        Returns:
+            True if a result was removed
+        """
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def info(self) -> dict:
+        """Hit, miss and eviction counters together with the current number of entries and their size"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size": self.size,
+            }
+
+    def wrap(self, func: Callable) -> Callable:
+        """Wrap 'func' so that its results are looked up in and stored to the cache"""
+
+        @wraps(func)
+        def cached(*args, **kwargs):
+            key = self.make_key(*args, **kwargs)
+            value = self.get(key, _MISSING)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                # a cancelled run may have stopped early, its result is not stored
+                if not is_cancelled():
+                    self.set(key, value)
+            return value
+
+        return cached
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with equal arguments, so they wait on a single execution and share its result.
+    Exceptions raised by the execution are raised for all of the calls. If the execution is cancelled, e.g.
+    superseded for the caller that started it, the waiting calls do not use its result and run again.
+
+    Args:
+        key: Function taking the same arguments as the callback and returning a hashable key.
+             If None the key is built from all arguments.
+    """
+
+    def __init__(self, key: Optional[Callable[..., Hashable]] = None):
+        self.key = key
+        self.executions = 0
+        self.shared = 0
+
+        self._in_flight: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def make_key(self, *args, **kwargs) -> Hashable:
+        if self.key is not None:
+            return self.key(*args, **kwargs)
+        return freeze((args, kwargs))
+
+    def info(self) -> dict:
+        """Number of executions and of calls that shared the result of another call's execution"""
+        with self._lock:
+            return {"executions": self.executions, "shared": self.shared}
+
+    def wrap(self, func: Callable) -> Callable:
+        """Wrap 'func' so that concurrent calls with equal arguments share one execution"""
+
+        @wraps(func)
+        def coalesced(*args, **kwargs):
+            key = self.make_key(*args, **kwargs)
+            with self._lock:
+                future = self._in_flight.get(key)
+                leader = future is None
+                if leader:
+                    future = self._in_flight[key] = Future()
+                    self.executions += 1
+                else:
+                    self.shared += 1
+
+            if not leader:
+                value = future.result()
+                if value is _CANCELLED:
+                    return coalesced(*args, **kwargs)
+                return value
+
+            try:
+                value = func(*args, **kwargs)
+            except BaseException as e:
+                if is_cancelled():
+                    future.set_result(_CANCELLED)
+                else:
+                    future.set_exception(e)
+                raise
+            else:
+                # a cancelled run may have stopped early, its result is only for the caller that started it
+                future.set_result(_CANCELLED if is_cancelled() else value)
+                return value
+            finally:
+                with self._lock:
+                    del self._in_flight[key]
+
+        return coalesced
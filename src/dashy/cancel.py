@@ -0,0 +1,96 @@
+import contextvars
+import threading
+from contextlib import contextmanager
+from typing import Hashable, Optional
+
+from dash.exceptions import PreventUpdate
+
+
+class CancelToken:
+    """Cancellation signal of a callback execution, checked cooperatively by the callback"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+_current_token: contextvars.ContextVar[Optional[CancelToken]] = contextvars.ContextVar(
+    "dashy_cancel_token", default=None
+)
+
+
+def is_cancelled() -> bool:
+    """
+    Check from inside a callback if the current execution has been cancelled, i.e. superseded by a newer one.
+    Long-running callbacks can check this between steps and stop early since the result will not be used.
+    """
+    token = _current_token.get()
+    return token is not None and token.cancelled
+
+
+def raise_if_cancelled():
+    """
+    Stop the current callback execution if it has been cancelled.
+
+    Raises:
+        PreventUpdate: If the execution has been cancelled
+    """
+    if is_cancelled():
+        raise PreventUpdate
+
+
+@contextmanager
+def cancel_scope(token: CancelToken):
+    """Make 'token' the cancel token of the callback executing within the scope"""
+    reset = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
+
+
+class InFlightTracker:
+    """
+    Keeps track of the in-flight execution of a callback for each session.
+    Starting a new execution cancels the previous one of the same session.
+    """
+
+    def __init__(self):
+        self.cancelled = 0
+
+        self._tokens: dict[Hashable, CancelToken] = {}
+        self._lock = threading.Lock()
+
+    def start(self, session: Optional[Hashable]) -> CancelToken:
+        token = CancelToken()
+        if session is None:
+            return token
+
+        with self._lock:
+            previous = self._tokens.get(session)
+            self._tokens[session] = token
+        if previous is not None:
+            previous.cancel()
+            self.cancelled += 1
+        return token
+
+    def finish(self, session: Optional[Hashable], token: CancelToken) -> bool:
+        """
+        Stop tracking an execution.
+
+        Returns:
+            True if the execution is still the latest one of the session, i.e. its result should be used
+        """
+        if session is None:
+            return not token.cancelled
+
+        with self._lock:
+            if self._tokens.get(session) is token:
+                del self._tokens[session]
+        return not token.cancelled
@@ -1,5 +1,85 @@
-from .core import *
-from .layout import *
-from .slider import *
-from .upload import upload, upload_and_show
-from .navigation import navbar, sidebar, tabs
+import importlib
+
+from .attributes import Size, Placement, Trigger, Color, InputType, SliderUpateMode
+from .helpers import (
+    create_options,
+    value_from_label,
+    get_margin_class,
+    get_padding_class,
+)
+
+# The modules of the same name as the slider, table and upload components only forward to the private modules
+# defining them. They are imported once here, so later imports of them find them loaded and do not bind the
+# modules over the components on the package.
+from . import slider, table, upload
+
+del slider, table, upload
+
+# component -> submodule defining it. The submodules pull in dash, plotly and pandas, so they are only imported
+# when one of their components is first used.
+_LAZY = {
+    "modal": "core",
+    "button": "core",
+    "button_group": "core",
+    "graph": "core",
+    "dropdown": "core",
+    "checks": "core",
+    "radios": "core",
+    "inputs": "core",
+    "card": "core",
+    "date_range_picker": "core",
+    "spinner": "core",
+    "progress": "core",
+    "interval": "core",
+    "hidden_div": "core",
+    "container": "layout",
+    "row": "layout",
+    "col": "layout",
+    "div": "layout",
+    "slider": "_slider",
+    "table": "_table",
+    "Selectable": "_table",
+    "SortAction": "_table",
+    "SortMode": "_table",
+    "FilterAction": "_table",
+    "Encoding": "_table",
+    "upload": "_upload",
+    "upload_and_show": "_upload",
+    "navbar": "navigation",
+    "sidebar": "navigation",
+    "tabs": "navigation",
+    # re-exported for 'from dashy.components import *'
+    "html": "core",
+    "dcc": "core",
+    "dbc": "core",
+    "Figure": "core",
+    "Component": "layout",
+}
+
+__all__ = [
+    *_LAZY,
+    "Size",
+    "Placement",
+    "Trigger",
+    "Color",
+    "InputType",
+    "SliderUpateMode",
+    "create_options",
+    "value_from_label",
+    "get_margin_class",
+    "get_padding_class",
+]
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
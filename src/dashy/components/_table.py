@@ -0,0 +1,286 @@
+import math
+from functools import partial
+from typing import Any, Callable, Optional, Union
+from enum import Enum
+
+from dash import dash_table, dcc, html
+from dash.exceptions import PreventUpdate
+import pandas as pd
+
+from dashy.filtering import DataFrameIndex
+from dashy.serialization import encode_columns
+
+
+class Selectable(Enum):
+    SINGLE = "single"
+    MULTI = "multi"
+    FALSE = False
+
+
+class SortAction(Enum):
+    NONE = "none"
+    NATIVE = "native"
+
+
+class FilterAction(Enum):
+    NONE = "none"
+    NATIVE = "native"
+
+
+class SortMode(Enum):
+    SINGLE = "single"
+    MULTI = "multi"
+
+
+class Encoding(Enum):
+    RECORDS = "records"
+    COLUMNS = "columns"
+
+
+# clientside callback decoding 'encode_columns' into the records of the DataTable
+_DECODE_COLUMNS = """
+function(encoded) {
+    if (!encoded) {
+        return window.dash_clientside.no_update;
+    }
+    const names = Object.keys(encoded.columns);
+    const columns = names.map(name => {
+        const column = encoded.columns[name];
+        if (Array.isArray(column)) {
+            return column;
+        }
+        if (column.categories) {
+            return column.codes.map(code => code < 0 ? null : column.categories[code]);
+        }
+        return column.dates.map(ms => {
+            if (ms === null) {
+                return null;
+            }
+            const iso = new Date(ms).toISOString();
+            return ms % 1000 ? iso.slice(0, 23) : iso.slice(0, 19);
+        });
+    });
+    const records = new Array(encoded.length);
+    for (let i = 0; i < encoded.length; i++) {
+        const record = {};
+        for (let j = 0; j < names.length; j++) {
+            record[names[j]] = columns[j][i];
+        }
+        records[i] = record;
+    }
+    return records;
+}
+"""
+
+
+# width of the columns of virtualized tables, in pixels
+VIRTUALIZED_COLUMN_WIDTH = 120
+
+
+def table(
+    data: pd.DataFrame,
+    id: str,
+    columns: Optional[list[dict]] = None,
+    page_size: int = 10,
+    row_selectable: Selectable = Selectable.FALSE,
+    col_selectable: Selectable = Selectable.FALSE,
+    cell_selectable: bool = False,
+    sort_action: SortAction = SortAction.NATIVE,
+    sort_mode: SortMode = SortMode.SINGLE,
+    filter_action: FilterAction = FilterAction.NONE,
+    app=None,
+    server_side: bool = True,
+    encoding: Encoding = Encoding.RECORDS,
+    float_precision: Optional[int] = None,
+    virtualization: bool = False,
+    fixed_header: bool = False,
+    height: str = "500px",
+    window_size: int = 1000,
+) -> Union[dash_table.DataTable, html.Div]:
+    """A Data Table.
+
+    Args:
+        data (pd.DataFrame): Data frame that should be displayed in the table
+        id (str): Id of the table
+        columns (Optional[list[dict]], optional): Columns of the table. Will be generated from the dataframe if not provided.
+        page_size (int, optional): Max columns per page. Defaults to 10.
+        row_selectable (Selectable, optional): If rows should be selectable. Defaults to Selectable.FALSE.
+        col_selectable (Selectable, optional): If cols should be selectable. Defaults to Selectable.FALSE.
+        cell_selectable (bool, optional): If cells should be selectable. Defaults to False.
+        sort_action (SortAction, optional): If sorting should be available. Defaults to SortAction.NATIVE.
+        sort_mode (SortMode, optional): If single or multisort should be performed on the columns. Defaults to SortMode.SINGLE.
+        filter_action (FilterAction, optional): If filtering should be available. Defaults to FilterAction.NONE.
+        app (DashyApp, optional): If passed the data frame stays on the server, paging, sorting and filtering
+            are done by a callback and only the current page is sent to the browser. The data frame is registered
+            in 'app.datasets' and the handle is the data of the store '<id>-dataset'. Defaults to None.
+        server_side (bool, optional): Only used if 'app' is passed. If False all rows are sent to the browser,
+            which pages, sorts and filters them. Defaults to True.
+        encoding (Encoding, optional): Encoding of the rows sent to the browser. Encoding.COLUMNS sends column
+            names once, text as distinct values and codes and numbers without converting every value to a Python
+            object, it is decoded in the browser. Requires 'app'. Defaults to Encoding.RECORDS.
+        float_precision (Optional[int], optional): Encoding.COLUMNS only. Number of decimals floats are rounded
+            to. Defaults to None, not rounded.
+        virtualization (bool, optional): If True the table scrolls instead of paging and the browser only renders
+            the visible rows, with a fixed header. In the server-side mode rows are fetched in windows of
+            'window_size' rows, otherwise all rows are sent. Defaults to False.
+        fixed_header (bool, optional): If True the header stays visible when scrolling the rows. Defaults to False.
+        height (str, optional): Height of the scrolling area with 'virtualization' or 'fixed_header'.
+            Defaults to "500px".
+        window_size (int, optional): Number of rows fetched at a time with 'virtualization' in the server-side
+            mode. Defaults to 1000.
+
+    Returns:
+        The DataTable. In the server-side mode or with Encoding.COLUMNS a Div holding the DataTable together
+        with the store of the dataset handle (id '<id>-dataset') and the store of the encoded rows.
+    """
+    if columns is None:
+        columns = [{"name": i, "id": i} for i in data.columns]
+    if encoding == Encoding.COLUMNS and app is None:
+        raise ValueError("'app' must be passed to use Encoding.COLUMNS")
+
+    options = dict(
+        columns=columns,
+        id=id,
+        page_size=page_size,
+        sort_mode=sort_mode.value,
+        row_selectable=row_selectable.value,
+        column_selectable=col_selectable.value,
+        cell_selectable=cell_selectable,
+    )
+    if virtualization or fixed_header:
+        options.update(
+            fixed_rows={"headers": True},
+            style_table={"height": height, "overflowY": "auto"},
+        )
+    if virtualization:
+        options.update(
+            virtualization=True,
+            # rows are rendered while scrolling, fixed column widths keep the columns from jumping
+            style_cell={
+                "minWidth": VIRTUALIZED_COLUMN_WIDTH,
+                "width": VIRTUALIZED_COLUMN_WIDTH,
+                "maxWidth": VIRTUALIZED_COLUMN_WIDTH,
+            },
+        )
+        if app is not None and server_side:
+            # each page is a window of rows, scrolled through in the browser
+            options["page_size"] = window_size
+        else:
+            options["page_action"] = "none"
+
+    encode = _records
+    data_output = (id, "data")
+    if encoding == Encoding.COLUMNS:
+        encode = partial(encode_columns, float_precision=float_precision)
+        data_output = (f"{id}-encoded", "data")
+
+    if app is not None and server_side:
+        # the data frame is kept in the app's dataset registry, the browser only gets its handle
+        dataset_id = f"{id}-dataset"
+        handle = app.datasets.register(data, handle=f"table-{id}", pin=True)
+        _page_callback(app, id, dataset_id, encode, data_output)
+        children = _server_side_layout(
+            options, dataset_id, handle, len(data), sort_action, filter_action
+        )
+    else:
+        children = [
+            dash_table.DataTable(
+                data=encode(data) if encoding == Encoding.RECORDS else [],
+                filter_action=filter_action.value,
+                sort_action=sort_action.value,
+                **options,
+            )
+        ]
+
+    if encoding == Encoding.COLUMNS:
+        # the encoded rows are sent to a store and decoded into the table's data in the browser
+        store = dcc.Store(id=data_output[0])
+        if not (app is not None and server_side):
+            store.data = encode(data)
+        app.cb(data_output, (id, "data"), clientside=_DECODE_COLUMNS)
+        children.append(store)
+
+    return children[0] if len(children) == 1 else html.Div(children)
+
+
+def _records(df: pd.DataFrame) -> list[dict]:
+    return df.to_dict("records")
+
+
+def _server_side_layout(
+    options: dict[str, Any],
+    dataset_id: Union[str, dict],
+    handle: str,
+    rows: int,
+    sort_action: SortAction,
+    filter_action: FilterAction,
+) -> list:
+    """Table with 'custom' actions, its rows are set by the page callback, and the store of the dataset handle"""
+    data_table = dash_table.DataTable(
+        data=[],
+        page_current=0,
+        page_count=_page_count(rows, options["page_size"]),
+        page_action="custom",
+        filter_action="none" if filter_action == FilterAction.NONE else "custom",
+        filter_query="",
+        sort_action="none" if sort_action == SortAction.NONE else "custom",
+        sort_by=[],
+        **options,
+    )
+    return [data_table, dcc.Store(id=dataset_id, data=handle)]
+
+
+def _page_callback(
+    app,
+    table_id: Union[str, dict],
+    dataset_id: Union[str, dict],
+    encode: Callable[[pd.DataFrame], Any],
+    data_output: tuple[Union[str, dict], str],
+):
+    """
+    Create the callback returning the requested page of the dataset of a server-side table. The ids can be
+    pattern-matching ids to serve all tables created from e.g. uploaded files.
+    """
+    outputs = [data_output, (table_id, "page_count")]
+    inputs = [
+        (table_id, "page_current"),
+        (table_id, "page_size"),
+        (table_id, "sort_by"),
+        (table_id, "filter_query"),
+    ]
+
+    def query_page(page_current, size, sort_by, filter_query, handle):
+        index = app.datasets.index(handle)
+        if index is None:
+            # evicted from the registry
+            raise PreventUpdate
+        return _query_page(index, encode, page_current, size, sort_by, filter_query)
+
+    name = table_id if isinstance(table_id, str) else table_id["type"]
+    query_page.__name__ = f"{name}_page"
+    app.cb(inputs, outputs, states=(dataset_id, "data"))(query_page)
+
+
+def _query_page(
+    index: DataFrameIndex,
+    encode: Callable[[pd.DataFrame], Any],
+    page_current: Optional[int],
+    page_size: int,
+    sort_by: Optional[list[dict]],
+    filter_query: Optional[str],
+) -> tuple[list[dict], int]:
+    """Filter, sort and slice the data frame like the DataTable would, returns the records of the page and the page count"""
+    try:
+        positions = index.query(filter_query, sort_by)
+    except (ValueError, TypeError):
+        # like the DataTable, an invalid query does not filter
+        positions = index.query(None, sort_by)
+
+    page_current = page_current or 0
+    start = page_current * page_size
+    page = index.df.iloc[positions[start : start + page_size]]  # noqa: E203
+    return encode(page), _page_count(len(positions), page_size)
+
+
+def _page_count(rows: int, page_size: int) -> int:
+    return max(math.ceil(rows / page_size), 1)
@@ -0,0 +1,305 @@
+import atexit
+import base64
+import hashlib
+import io
+import datetime
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Union
+
+import dash_bootstrap_components as dbc
+from dash import MATCH, html, dcc
+from dash.exceptions import PreventUpdate
+import pandas as pd
+
+from dashy.cache import CallbackCache
+from dashy.datasets import frame_size
+from .layout import col, div, row
+from ._table import (
+    FilterAction,
+    SortAction,
+    _page_callback,
+    _records,
+    _server_side_layout,
+)
+
+
+def upload(
+    id: str, multiple: bool = False, max_size: int = -1, min_size: int = 0
+) -> dbc.Col:
+    """Upload component to upload and use files.
+
+    Args:
+        id (str): Iof the component
+        multiple (bool, optional): If multiple files should be able to be uploaded. Defaults to False.
+        max_size (int, optional): Max file size int bytes. Defaults to -1.
+        min_size (int, optional): Min file size in bytes. Defaults to 0.
+    """
+    style = {
+        "height": "60px",
+        "lineHeight": "60px",
+        "borderWidth": "1px",
+        "borderStyle": "dashed",
+        "borderRadius": "5px",
+        "textAlign": "center",
+    }
+
+    children = html.Div(["Drag and Drop or ", html.A("Select Files")])
+
+    return col(
+        [
+            row(
+                dcc.Upload(
+                    id=id,
+                    children=children,
+                    style=style,
+                    multiple=multiple,
+                    max_size=max_size,
+                    min_size=min_size,
+                ),
+                margin=0,
+            )
+        ],
+        auto_size=False,
+        margin=0,
+    )
+
+
+def upload_and_show(
+    id: str,
+    app,
+    multiple: bool = False,
+    max_size: int = -1,
+    min_size: int = 0,
+    max_rows: Optional[int] = None,
+    max_workers: int = 4,
+    cache: Optional[Union[CallbackCache, bool]] = None,
+) -> dbc.Col:
+    """Upload component that also generates a table when a csv or excel file is uploaded
+
+    Args:
+        id (str): Iof the component
+        app (DashyApp): The Dashy app. Needed in order to create the callback generating the table
+        multiple (bool, optional): If multiple files should be able to be uploaded. Defaults to False.
+        max_size (int, optional): Max file size int bytes. Defaults to -1.
+        min_size (int, optional): Min file size in bytes. Defaults to 0.
+        max_rows (Optional[int], optional): Only read the first rows of the files, e.g. to preview large files.
+            Defaults to None, all rows.
+        max_workers (int, optional): Max number of files parsed at the same time when multiple files are
+            uploaded, and of processes parsing Excel files. Defaults to 4.
+        cache (Optional[Union[CallbackCache, bool]], optional): Cache of parsed files by a hash of their contents,
+            so uploading the same file again does not parse it again. Defaults to None, a cache of at most
+            512 MB of data frames. Pass False to not cache.
+    """
+    # id of the output element that will hold the table
+    output_id = f"{id}-output"
+
+    parser = _FileParser(id, max_rows, max_workers, cache)
+    if parser.cache is not None:
+        app.callback_caches[f"{id}-files"] = parser.cache
+
+    # the tables of the files are paged on the server, one callback serves all of them
+    table_id = {"type": f"{id}-table", "index": MATCH}
+    dataset_id = {"type": f"{id}-dataset", "index": MATCH}
+    _page_callback(app, table_id, dataset_id, _records, (table_id, "data"))
+
+    # callback to generate the table showing the uploaded data
+    @app.cb(
+        inputs=(id, "contents"),
+        outputs=[(output_id, "children"), (f"{id}-datasets", "data")],
+        states=[(id, "filename"), (id, "last_modified")],
+    )
+    def update_output(list_of_contents, list_of_names, list_of_dates):
+        if list_of_contents is None:
+            raise PreventUpdate
+
+        single = not isinstance(list_of_contents, list)
+        if single:
+            list_of_contents = [list_of_contents]
+            list_of_names = [list_of_names]
+            list_of_dates = [list_of_dates]
+
+        parsed = parser.parse_all(list_of_contents, list_of_names)
+
+        children = []
+        handles = []
+        for i, ((handle, df), n, d) in enumerate(
+            zip(parsed, list_of_names, list_of_dates)
+        ):
+            if not isinstance(df, pd.DataFrame):
+                # the error message of a file that could not be parsed
+                children.append(df)
+                handles.append(None)
+                continue
+            try:
+                app.datasets.register(df, handle=handle)
+            except ValueError:
+                children.append(html.Div([f"{n} is too large to show."]))
+                handles.append(None)
+                continue
+            children.append(_generate_table(id, i, n, d, df, handle))
+            handles.append(handle)
+        return children, handles[0] if single else handles
+
+    upload_comp = upload(id=id, multiple=multiple, max_size=max_size, min_size=min_size)
+    upload_comp.children.append(row(div(id=output_id)))
+    upload_comp.children.append(dcc.Store(id=f"{id}-datasets"))
+    return upload_comp
+
+
+class _FileParser:
+    """Parses uploaded files, multiple files concurrently, and caches the data frames by the file contents"""
+
+    def __init__(
+        self,
+        name: str,
+        max_rows: Optional[int],
+        max_workers: int,
+        cache: Optional[Union[CallbackCache, bool]],
+    ):
+        if cache is None or cache is True:
+            cache = CallbackCache(
+                max_entries=32, max_size=512 * 2**20, sizeof=frame_size
+            )
+        elif cache is False:
+            cache = None
+
+        self.max_rows = max_rows
+        self.cache = cache
+        # the C parser of pandas releases the GIL while parsing CSV files
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"{name}-parse"
+        )
+        # Excel files are parsed by openpyxl, in pure Python holding the GIL, so they are parsed in processes.
+        # The pool is started on the first Excel file.
+        self._max_workers = max_workers
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def parse_all(self, list_of_contents: list[str], list_of_names: list[str]) -> list:
+        if len(list_of_contents) == 1:
+            return [self.parse(list_of_contents[0], list_of_names[0])]
+        return list(self._executor.map(self.parse, list_of_contents, list_of_names))
+
+    def parse(
+        self, contents: str, filename: str
+    ) -> tuple[str, Union[pd.DataFrame, html.Div]]:
+        """
+        Parse a file.
+
+        Returns:
+            Handle identifying the file by its contents, and its data frame or a Div with an error message if it
+            could not be parsed
+        """
+        file_type = "csv" if "csv" in filename else "xls" if "xls" in filename else ""
+        handle = (
+            f"upload-{file_type}-{_content_hash(contents)}-{self.max_rows or 'all'}"
+        )
+
+        df = None if self.cache is None else self.cache.get(handle)
+        if df is None:
+            if file_type == "xls":
+                pool = self._process_pool()
+                df = pool.submit(_parse_csv, contents, filename, self.max_rows).result()
+            else:
+                df = _parse_csv(contents, filename, self.max_rows)
+            if self.cache is not None and isinstance(df, pd.DataFrame):
+                self.cache.set(handle, df)
+        return handle, df
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._processes is None:
+                # spawned, forking the threads of the server is not safe
+                self._processes = ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                atexit.register(self._processes.shutdown)
+            return self._processes
+
+
+def _generate_table(id: str, index: int, filename, file_date, df, handle: str):
+    options = dict(
+        id={"type": f"{id}-table", "index": index},
+        columns=[{"name": i, "id": i} for i in df.columns],
+        page_size=10,
+    )
+    return html.Div(
+        [
+            html.H5(filename),
+            html.H6(datetime.datetime.fromtimestamp(file_date)),
+            *_server_side_layout(
+                options,
+                {"type": f"{id}-dataset", "index": index},
+                handle,
+                len(df),
+                SortAction.NATIVE,
+                FilterAction.NONE,
+            ),
+        ]
+    )
+
+
+def _parse_csv(contents, filename, max_rows: Optional[int] = None) -> pd.DataFrame:
+    """Parse and read the csv or xls into a dataframe"""
+    # skip the 'data:<content type>;base64,' prefix without copying the contents
+    start = contents.index(",") + 1
+    try:
+        if "csv" in filename:
+            # Assume that the user uploaded a CSV file. It is decoded while it is read, so the whole file is never
+            # held decoded in memory, and reading stops after 'max_rows'. The C engine is used with and without
+            # 'max_rows', so the inferred types do not depend on it.
+            stream = io.BufferedReader(
+                _Base64Reader(contents, start), buffer_size=_CHUNK_SIZE
+            )
+            df = pd.read_csv(stream, encoding="utf-8", engine="c", nrows=max_rows)
+        elif "xls" in filename:
+            # Assume that the user uploaded an excel file
+            df = pd.read_excel(
+                io.BytesIO(base64.b64decode(contents[start:])), nrows=max_rows
+            )
+        else:
+            raise ValueError("Can only parse CSV or Excel files")
+    except Exception as e:
+        print(e)
+        return html.Div([f"There was an error processing {filename}."])
+
+    return df
+
+
+# bytes decoded at a time when reading uploaded files
+_CHUNK_SIZE = 1 << 20
+
+
+def _content_hash(contents: str) -> str:
+    """Hash of an uploaded file, the data URI is hashed in chunks to not copy it whole"""
+    digest = hashlib.blake2b(digest_size=16)
+    for start in range(0, len(contents), _CHUNK_SIZE):
+        digest.update(contents[start : start + _CHUNK_SIZE].encode())  # noqa: E203
+    return digest.hexdigest()
+
+
+class _Base64Reader(io.RawIOBase):
+    """Binary stream of base64 encoded text, decoded a chunk at a time while it is read"""
+
+    def __init__(self, text: str, start: int = 0):
+        self._text = text
+        self._pos = start
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if not self._pending and self._pos < len(self._text):
+            # 4 base64 characters are 3 bytes
+            end = self._pos + max(len(buffer) // 3, 1) * 4
+            self._pending = base64.b64decode(self._text[self._pos : end])  # noqa: E203
+            self._pos = end
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
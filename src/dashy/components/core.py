@@ -546,7 +546,7 @@ def hidden_div(id: str, children: Optional[Any] = None) -> html.Div:
 
     This can for example be used for storing some data when some action has been completed.
 
-    In the background these divs are also created when a callback without in output is created.
+    In the background a single hidden div is also created that is shared by all callbacks without outputs.
 
     Args:
         id (str): Id of the div
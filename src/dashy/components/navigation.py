@@ -1,8 +1,9 @@
-from typing import List, Optional, Union
+from typing import Any, Callable, List, Optional, Union
 
 import dash_bootstrap_components as dbc
 from dash import html, dcc
 
+from dashy.cache import CallbackCache
 from .attributes import Color
 from .helpers import value_from_label
 from .layout import container
@@ -45,17 +46,31 @@ def navbar(
 
 
 def sidebar(
-    title: str, id: str, links: Optional[list[str]], text: Optional[str]
+    title: str,
+    id: str,
+    links: Optional[list[str]],
+    text: Optional[str],
+    app=None,
+    pages: Optional[dict[str, Callable[..., Any]]] = None,
+    states: Optional[list[tuple[str, str]]] = None,
+    cache: Optional[CallbackCache] = None,
 ) -> html.Div:
     """A sidebar.
 
     The urls are built by converting the link string to kebab-case. So for example 'My Analysis' yields the url '/my-analysis'.
 
+    If 'pages' is passed the page content is built by the page functions when a link is clicked. Each page is
+    built once and then served from a fragment cache.
+
     Args:
         title: Title fo the sidebar
         id: Id of the sidebar
         links: Links that will be available. These will be mapped to urls to be used for callbacks.
         text: Description text that will be displayed
+        app (DashyApp): The Dashy app. Needed together with 'pages' in order to create the callback switching page
+        pages: Functions building the content of each page, by link. The first page is also shown at '/'.
+        states: (id, property) tuples passed to the page functions. Pages are cached per set of state values.
+        cache: Fragment cache of the pages, use it to invalidate pages. Defaults to a cache of 32 pages.
     """
 
     SIDEBAR_STYLE = {
@@ -97,6 +112,19 @@ def sidebar(
 
     content = html.Div(id=f"{id}-content", style=CONTENT_STYLE)
 
+    if pages is not None:
+        routes = {f"/{value_from_label(link)}": page for link, page in pages.items()}
+        routes["/"] = next(iter(pages.values()))
+        _route_pages(
+            app,
+            name=f"{id}-pages",
+            trigger=(f"{id}-url", "pathname"),
+            content_id=f"{id}-content",
+            routes=routes,
+            states=states,
+            cache=cache,
+        )
+
     return html.Div([dcc.Location(id=f"{id}-url"), sidebar, content])
 
 
@@ -106,15 +134,26 @@ def tabs(
     content_id: Optional[str],
     tab_ids: Optional[List[str]] = None,
     active_tab: Optional[Union[str, int]] = None,
+    app=None,
+    pages: Optional[dict[str, Callable[..., Any]]] = None,
+    states: Optional[list[tuple[str, str]]] = None,
+    cache: Optional[CallbackCache] = None,
 ) -> dbc.Container:
     """Create a set of tabs to navigate between different contents.
 
+    If 'pages' is passed the content is built by the page functions when switching tab. Each tab's content is
+    built once and then served from a fragment cache.
+
     Args:
         labels: Tab labels, the text that will be shown for each tab.
         id: Id of the tabs
         content_id : Id of the content element that will be populated when switching tab.
         tab_ids: Ids for each tab, will be created if not passed. Defaults to None.
         active_tab: Sets the active tab, by index or label. Defaults to None.
+        app (DashyApp): The Dashy app. Needed together with 'pages' in order to create the callback switching tab.
+        pages: Functions building the content of each tab, by tab label or tab id.
+        states: (id, property) tuples passed to the page functions. Content is cached per set of state values.
+        cache: Fragment cache of the content, use it to invalidate tabs. Defaults to a cache of 32 contents.
 
     Returns:
         dbc.Container: Containing the tabs
@@ -140,8 +179,48 @@ def tabs(
     if content_id is None:
         content_id = "tab-content"
 
+    if pages is not None:
+        routes = {
+            tab_ids[labels.index(key)] if key in labels else key: page
+            for key, page in pages.items()
+        }
+        _route_pages(
+            app,
+            name=f"{id}-pages",
+            trigger=(id, "active_tab"),
+            content_id=content_id,
+            routes=routes,
+            states=states,
+            cache=cache,
+        )
+
     return container(
         id="tab-container",
         children=[tab_element, container(id=content_id, fluid=True)],
         fluid=True,
     )
+
+
+def _route_pages(
+    app,
+    name: str,
+    trigger: tuple[str, str],
+    content_id: str,
+    routes: dict[str, Callable[..., Any]],
+    states: Optional[list[tuple[str, str]]],
+    cache: Optional[CallbackCache],
+):
+    """Create the callback building the content of the current page, cached by page and state values"""
+    if app is None:
+        raise ValueError("'app' must be passed together with 'pages'")
+    if cache is None:
+        cache = CallbackCache(max_entries=32)
+
+    def switch_page(route, *state_values):
+        page = routes.get(route)
+        if page is None:
+            return None
+        return page(*state_values)
+
+    switch_page.__name__ = name
+    app.cb(trigger, (content_id, "children"), states=states, cache=cache)(switch_page)
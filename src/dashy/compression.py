@@ -0,0 +1,58 @@
+import gzip
+
+import flask
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Dash routes serving callback responses and layouts
+COMPRESSED_ROUTES = ("_dash-update-component", "_dash-layout", "_dash-dependencies")
+
+
+class ResponseCompressor:
+    """
+    Compresses large callback and layout responses with brotli, if the brotli package is installed, or gzip
+    depending on what the browser accepts.
+
+    Args:
+        min_size: Responses smaller than this, in bytes, are not compressed
+        level: Compression level, 1-9 where 9 is the smallest and slowest
+    """
+
+    def __init__(self, min_size: int = 1024, level: int = 6):
+        if not 1 <= level <= 9:
+            raise ValueError("'level' must be between 1 and 9")
+
+        self.min_size = min_size
+        self.level = level
+
+    def __call__(self, response: flask.Response) -> flask.Response:
+        if (
+            response.status_code != 200
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or not flask.request.path.endswith(COMPRESSED_ROUTES)
+        ):
+            return response
+
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+
+        accepted = flask.request.accept_encodings
+        if brotli is not None and accepted["br"]:
+            encoding = "br"
+            data = brotli.compress(data, quality=self.level)
+        elif accepted["gzip"]:
+            encoding = "gzip"
+            data = gzip.compress(data, compresslevel=self.level)
+        else:
+            return response
+
+        response.set_data(data)
+        response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        return response
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 import dash_bootstrap_components as dbc
@@ -6,6 +7,14 @@ import dash_bootstrap_components as dbc
 DASHY_DIR = Path(__file__).parent
 ASSETS_PATH = DASHY_DIR / "assets"
 
+# compiled theme CSS etc. is kept here
+CACHE_DIR = Path(
+    os.environ.get(
+        "DASHY_CACHE_DIR",
+        Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "dashy",
+    )
+)
+
 EXTERNAL_STYLESHEETS = [dbc.themes.FLATLY]
 
 EXTERNAL_SCRIPTS = []
@@ -1,17 +1,36 @@
+import inspect
 import logging
 from functools import wraps
+from typing import Any, Callable, Optional, Union
 
 import dash
+import flask
 from dash import html, dcc
-from dash.dependencies import Output, Input, State
+from dash.dependencies import Output, Input, State, ClientsideFunction
 from dash_bootstrap_components import themes
-import plotly.graph_objs as go
+
+from dashy.aio import EventLoopThread
+from dashy.background import BackgroundRunner, with_progress
+from dashy.cache import CallbackCache, SingleFlight
+from dashy.cancel import InFlightTracker, cancel_scope
+from dashy.compression import ResponseCompressor
+from dashy.datasets import DatasetRegistry
+from dashy.dedup import OutputDeduplicator
+from dashy.metrics import CallbackMetrics
+from dashy.ratelimit import RateLimiter, to_seconds
+from dashy.serialization import use_json_engine
+from dashy.themes import Theme
 
 
 logging.basicConfig(format="%(levelname)s %(asctime)-15s %(message)s")
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+# id of the store holding the id of the current page session
+SESSION_ID = "_dashy-session"
+# id of the hidden div shared as output by all callbacks without outputs
+SINK_ID = "_dashy-sink"
+
 
 def create_app(name: str, layout: list = None, theme=themes.FLATLY, **kwargs):
     """
@@ -35,38 +54,156 @@ def create_app(name: str, layout: list = None, theme=themes.FLATLY, **kwargs):
 class DashyApp(dash.Dash):
     """
     Small wrapper class for dash.Dash class
+
+    Args:
+        theme: UI Theme to be used
+        layout: UI layout to be display by the app
+        metrics: If True callback metrics are recorded and served at '/_dashy/metrics'
+        json_engine: Encoder for callback responses and the layout, see 'use_json_engine'. It applies to all apps
+                     in the process. If None the encoder is not changed.
+        compression: If True large callback and layout responses are compressed with brotli or gzip
+        compression_min_size: Min response size in bytes to compress
+        compression_level: Compression level, 1-9
+        dashy_theme: Theme, or theme class, compiled once into the default plotly template for all figures and a
+                     CSS bundle. The CSS is served with a fingerprinted filename and long-lived cache headers.
+        kwargs: Passed to dash.Dash
     """
 
-    def __init__(self, theme, layout: list, **kwargs):
+    def __init__(
+        self,
+        theme,
+        layout: list,
+        metrics: bool = True,
+        json_engine: Optional[Union[str, Callable[[Any], str]]] = None,
+        compression: bool = True,
+        compression_min_size: int = 1024,
+        compression_level: int = 6,
+        dashy_theme: Optional[Union[Theme, type]] = None,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
 
-        # self.theme = theme()
-        self.hidden_div_count = 0
+        # encoder for callback responses and the layout, see 'use_json_engine'
+        if json_engine is not None:
+            use_json_engine(json_engine)
+
+        # compile the theme once, figures get it through the default template
+        if isinstance(dashy_theme, type):
+            dashy_theme = dashy_theme()
+        self.theme = dashy_theme
+        if self.theme is not None:
+            self.theme.register()
+            self._theme_css = self.theme.compile()
+            self.server.add_url_rule(
+                f"{self.config.routes_pathname_prefix}_dashy/theme/<filename>",
+                "dashy_theme_css",
+                self._serve_theme_css,
+            )
+            self.config.external_stylesheets.append(
+                f"{self.config.requests_pathname_prefix}_dashy/theme/{self._theme_css.name}"
+            )
+
         self.layout = html.Div(layout)
 
-    def launch(self, debug=False, **kwargs):
+        # caches of memoized callbacks, by callback name
+        self.callback_caches: dict[str, CallbackCache] = {}
+        # coalescing of concurrent equal calls, by callback name
+        self.single_flights: dict[str, SingleFlight] = {}
+        # worker pools of background callbacks, by callback name
+        self.background_runners: dict[str, BackgroundRunner] = {}
+        # data frames kept on the server for tables and uploads, the browser only holds their handles
+        self.datasets = DatasetRegistry()
+
+        # compress large callback and layout responses. Registered before the metrics so the metrics get
+        # the uncompressed size, after request functions are called in reverse order.
+        if compression:
+            self.server.after_request(
+                ResponseCompressor(
+                    min_size=compression_min_size, level=compression_level
+                )
+            )
 
-        # Generate css files for theme
-        # self.theme.compile()
+        # latency, exception and payload metrics of the callbacks, served in the Prometheus format
+        self.metrics = CallbackMetrics() if metrics else None
+        if self.metrics is not None:
+            self.server.add_url_rule(
+                f"{self.config.routes_pathname_prefix}_dashy/metrics",
+                "dashy_metrics",
+                self._serve_metrics,
+            )
+            self.server.after_request(self._record_response_size)
+        self._callback_names: set[str] = set()
+        self._session_state: Optional[State] = None
+        self._sink_count = 0
+        # event loop running the async callbacks
+        self.event_loop = EventLoopThread()
+
+    def launch(self, debug=False, **kwargs):
 
         # Start server
         self.run_server(debug=debug, **kwargs)
 
-    def cb(self, inputs, outputs=None, states=None):
+    def cb(
+        self,
+        inputs,
+        outputs=None,
+        states=None,
+        cache: Optional[Union[CallbackCache, bool]] = None,
+        background: bool = False,
+        progress: Optional[tuple[str, str]] = None,
+        max_concurrency: int = 4,
+        poll_interval: int = 500,
+        clientside: Optional[Union[str, tuple[str, str]]] = None,
+        suppress_unchanged: bool = False,
+        debounce: Optional[Union[int, dict[tuple[str, str], int]]] = None,
+        throttle: Optional[Union[int, dict[tuple[str, str], int]]] = None,
+        cancel_superseded: bool = False,
+        single_flight: bool = False,
+    ):
         """
         wrapper function for the original Dash callback function.
         This in order to make it more flexible and also take away some limitations.
+
+        The callback can also be an 'async def' function, it is then run on an event loop shared by all async
+        callbacks so independent I/O can be awaited concurrently.
+
+        Args:
+            inputs: Input or list of inputs as (id, property) tuples
+            outputs: Output or list of outputs as (id, property) tuples
+            states: State or list of states as (id, property) tuples
+            cache: If passed, results are memoized so identical input/state values returns the stored result.
+                   Pass True to use a CallbackCache with default settings.
+            background: If True the callback runs on a worker pool and returns right away. The outputs are
+                        updated when the result is collected by polling.
+            progress: Background only. (id, property) tuple that is updated with progress values during the run,
+                      e.g. the value of a progress bar. A 'set_progress' function is then passed as the first
+                      argument to the callback.
+            max_concurrency: Background only. Max number of concurrent runs of the callback, more runs are queued.
+            poll_interval: Background only. How often the result is polled for, in milliseconds.
+            clientside: Register a clientside (JavaScript) callback instead, run in the browser without a request
+                        to the server. Either an inline JavaScript function as a string or a
+                        (namespace, function name) tuple of a function defined on 'window.dash_clientside' by a
+                        script in the assets folder. No Python function needs to be decorated.
+            suppress_unchanged: If True outputs with the same value as the last response to the same page session
+                                are replaced with no_update, so they are not sent and rendered again.
+            debounce: Milliseconds to wait before running, dropping the run if a newer event arrived meanwhile.
+                      Applies to all inputs, or pass a dict with (id, property) input tuples as keys to set it
+                      per input. Applied on the server per page session.
+            throttle: Min milliseconds between runs, events arriving sooner wait and are dropped if a newer event
+                      arrived meanwhile. Applies to all inputs or per input like 'debounce'. Note that a waiting
+                      request holds a server worker thread for the debounce/throttle time.
+            cancel_superseded: If True a run is cancelled when a newer run of the callback starts in the same page
+                               session, and its result is ignored. The callback can check 'dashy.is_cancelled()'
+                               to stop early. Superseded background runs are always cancelled.
+            single_flight: If True concurrent runs with equal input/state values, e.g. from different users,
+                           wait on one run and share its result. Uses the key function of 'cache' if passed.
+                           If the shared run is cancelled the waiting runs run again.
         """
 
         # Handle outputs
-        if outputs is None:
-            self.hidden_div_count += 1
-            output_id = f"auto-hidden-{self.hidden_div_count}"
-            output_element = "children"
-            self.layout.children.append(
-                html.Div(id=output_id, style={"display": "none"})
-            )
-            outputs = [(output_id, output_element)]
+        no_output = outputs is None
+        if no_output:
+            outputs = []
         elif not isinstance(outputs, tuple) and not isinstance(outputs, list):
             raise ValueError("'inputs' needs to be a tuple or a list of tuples")
         elif isinstance(outputs, tuple):
@@ -80,7 +217,10 @@ class DashyApp(dash.Dash):
                 raise ValueError("an input must contain exactly 2 strings")
             output_id, output_element = o
             output_list.append(Output(output_id, output_element))
-        if len(output_list) == 1:
+        if no_output:
+            # all callbacks without outputs share one sink, it is never updated
+            output_list = self._sink()
+        elif len(output_list) == 1:
             output_list = output_list[0]
 
         # Handle inputs
@@ -116,12 +256,120 @@ class DashyApp(dash.Dash):
                 state_id, state_element = s
                 state_list.append(State(state_id, state_element))
 
+        limiter = None
+        if debounce is not None or throttle is not None:
+            input_ids = [f"{i.component_id}.{i.component_property}" for i in input_list]
+            limiter = RateLimiter(
+                debounce=to_seconds(debounce, input_ids, "debounce"),
+                throttle=to_seconds(throttle, input_ids, "throttle"),
+            )
+
+        if clientside is not None:
+            if (
+                (cache is not None and cache is not False)
+                or background
+                or suppress_unchanged
+                or limiter
+                or cancel_superseded
+                or single_flight
+            ):
+                raise ValueError(
+                    "only inputs, outputs and states can be used with clientside callbacks"
+                )
+            self._clientside_callback(clientside, output_list, input_list, state_list)
+            return lambda func: func
+
+        if progress is not None and not background:
+            raise ValueError("'progress' can only be used with 'background=True'")
+        if suppress_unchanged and background:
+            raise ValueError(
+                "'suppress_unchanged' can not be used with 'background=True'"
+            )
+
+        if cache is True:
+            cache = CallbackCache()
+        elif cache is False:
+            cache = None
+
+        extra_states = []
+        if suppress_unchanged or cancel_superseded or limiter is not None:
+            extra_states.append(self._session())
+
         def decorator_callback(func):
+            name = self._callback_name(func)
+
+            update = func
+            if progress is not None:
+                # passed innermost, so it is not part of the cache or single flight key
+                update = with_progress(update)
+            if inspect.iscoroutinefunction(func):
+                update = self.event_loop.wrap(update)
+
+            if cache is not None:
+                self.callback_caches[name] = cache
+                update = cache.wrap(update)
+
+            if single_flight:
+                flight = SingleFlight(key=cache.key if cache is not None else None)
+                self.single_flights[name] = flight
+                update = flight.wrap(update)
+
+            if self.metrics is not None:
+                update = self.metrics.wrap(
+                    name, update, ignore=(dash.exceptions.PreventUpdate,)
+                )
+
+            if background:
+                self._background_callback(
+                    name,
+                    update,
+                    output_list,
+                    input_list,
+                    state_list + extra_states,
+                    progress=progress,
+                    max_concurrency=max_concurrency,
+                    poll_interval=poll_interval,
+                    no_output=no_output,
+                    limiter=limiter,
+                    with_session=bool(extra_states),
+                )
+                return lambda: None
+
+            single_output = not isinstance(output_list, list)
+            deduplicator = OutputDeduplicator() if suppress_unchanged else None
+            tracker = InFlightTracker() if cancel_superseded else None
+
             # Create real Dash callback
-            @self.callback(output=output_list, inputs=input_list, state=state_list)
+            @self.callback(
+                output=output_list, inputs=input_list, state=state_list + extra_states
+            )
             def dash_update(*args, **kwargs):
-                components = func(*args, **kwargs)
-                # components = self.apply_theme(components)
+                flask.g.dashy_callback = name
+
+                session = None
+                if extra_states:
+                    *args, session = args
+
+                if limiter is not None and not limiter.admit(session, _triggered()):
+                    raise dash.exceptions.PreventUpdate
+
+                if tracker is None:
+                    components = update(*args, **kwargs)
+                else:
+                    token = tracker.start(session)
+                    try:
+                        with cancel_scope(token):
+                            components = update(*args, **kwargs)
+                    finally:
+                        latest = tracker.finish(session, token)
+                    if not latest:
+                        # superseded by a newer run, the result is not needed
+                        raise dash.exceptions.PreventUpdate
+
+                if no_output:
+                    components = dash.no_update
+                if deduplicator is not None:
+                    components = deduplicator.filter(session, components, single_output)
                 return components
 
             # For completeness
@@ -134,58 +382,211 @@ class DashyApp(dash.Dash):
 
         return decorator_callback
 
-    def apply_theme(self, components):
+    def _session(self) -> State:
         """
-        Recursively apply theme to components
+        State holding an id of the current page session, i.e. it is new for each page load.
 
-        Args:
-            components: list of components
+        The store and the clientside callback creating the id are added the first time it is needed.
+        """
+        if self._session_state is None:
+            self.layout.children.append(dcc.Store(id=SESSION_ID))
+            self.clientside_callback(
+                """
+                function(id) {
+                    if (window.crypto && window.crypto.randomUUID) {
+                        return window.crypto.randomUUID();
+                    }
+                    return Date.now().toString(36) + Math.random().toString(36).slice(2);
+                }
+                """,
+                Output(SESSION_ID, "data"),
+                Input(SESSION_ID, "id"),
+            )
+            self._session_state = State(SESSION_ID, "data")
+        return self._session_state
 
-        Returns:
-            components or None
+    def _sink(self) -> Output:
+        """
+        Output for a callback without outputs.
+
+        All such callbacks share one hidden div, added to the layout the first time it is needed, so the layout
+        does not grow with the number of callbacks. Each callback gets its own 'data-*' property of the div
+        since Dash does not allow two callbacks with the same output.
         """
-        if components is None:
-            return
-
-        if isinstance(components, go.Figure):
-            self._apply_to_figure(components)
-
-        if isinstance(components, (list, tuple)):
-            for comp in components:
-                if isinstance(comp, dcc.Graph):
-                    # Add theme colors to layout
-                    self._apply_to_figure(comp.figure)
-                if isinstance(comp, go.Figure):
-                    self._apply_to_figure(comp)
-
-                elif hasattr(comp, "children"):
-                    self.apply_theme(comp.children)
-        return components
-
-    def _apply_to_figure(self, figure):
-        figure.layout.paper_bgcolor = self.theme.white
-        figure.layout.plot_bgcolor = self.theme.white
-
-        figure.layout.font["color"] = self.theme.black
-
-        figure.layout.xaxis["zerolinecolor"] = self.theme.background_color
-        figure.layout.yaxis["zerolinecolor"] = self.theme.background_color
-
-        figure.layout.xaxis["gridcolor"] = self.theme.background_color
-        figure.layout.yaxis["gridcolor"] = self.theme.background_color
-
-        margin = figure.layout.margin
-        default_margin = {
-            "l": margin.l if margin.l is not None else 40,
-            "r": margin.r if margin.r is not None else 40,
-            "b": margin.b if margin.b is not None else 40,
-            "t": margin.t if margin.t is not None else 70,
-            "pad": margin.pad if margin.pad is not None else 0,
-        }
-        figure.layout.margin = default_margin
-
-        title_text = figure.layout.title["text"]
-        if title_text is not None:
-            figure.layout.title = dict(
-                text=title_text, x=0.5, y=1.0, pad=dict(t=30), font=dict(size=18)
+        if self._sink_count == 0:
+            self.layout.children.append(
+                html.Div(id=SINK_ID, style={"display": "none"})
+            )
+        self._sink_count += 1
+        return Output(SINK_ID, f"data-callback-{self._sink_count}")
+
+    def _clientside_callback(
+        self,
+        clientside: Union[str, tuple[str, str]],
+        output_list,
+        input_list: list,
+        state_list: list,
+    ):
+        if isinstance(clientside, tuple):
+            if len(clientside) != 2:
+                raise ValueError(
+                    "a clientside function must be a (namespace, function name) tuple"
+                )
+            clientside = ClientsideFunction(*clientside)
+        elif not isinstance(clientside, str):
+            raise ValueError(
+                f"'clientside' must be a str or a tuple was: {type(clientside)}"
             )
+
+        self.clientside_callback(clientside, output_list, input_list, state_list)
+
+    def _background_callback(
+        self,
+        name: str,
+        update,
+        output_list,
+        input_list: list,
+        state_list: list,
+        progress: Optional[tuple[str, str]],
+        max_concurrency: int,
+        poll_interval: int,
+        no_output: bool = False,
+        limiter: Optional[RateLimiter] = None,
+        with_session: bool = False,
+    ):
+        """
+        Register a callback that submits 'update' to a worker pool instead of running it in the request.
+
+        If 'with_session' is True the last of the states is the id of the session, it is not passed to 'update'.
+
+        The same Dash callback both starts the run, when triggered by any of the inputs, and collects the result,
+        when triggered by an interval that is enabled while the run is ongoing.
+        """
+        runner = BackgroundRunner(max_workers=max_concurrency, name=name)
+        self.background_runners[name] = runner
+
+        job_id = f"_dashy-bg-{name}-job"
+        poll_id = f"_dashy-bg-{name}-poll"
+        self.layout.children.append(dcc.Store(id=job_id))
+        self.layout.children.append(
+            dcc.Interval(id=poll_id, interval=poll_interval, disabled=True)
+        )
+
+        single_output = not isinstance(output_list, list)
+        outputs = [output_list] if single_output else output_list
+        n_outputs = len(outputs)
+        n_inputs = len(input_list)
+
+        bg_outputs = outputs + [Output(job_id, "data"), Output(poll_id, "disabled")]
+        if progress is not None:
+            bg_outputs.append(Output(*progress))
+
+        def respond(
+            results=None, job=None, job_id=dash.no_update, disabled=dash.no_update
+        ):
+            if results is None:
+                results = [dash.no_update] * n_outputs
+            response = results + [job_id, disabled]
+            if progress is not None:
+                response.append(job.progress if job is not None else dash.no_update)
+            return response
+
+        @self.callback(
+            output=bg_outputs,
+            inputs=input_list + [Input(poll_id, "n_intervals")],
+            state=state_list + [State(job_id, "data")],
+        )
+        def dash_update(*args):
+            # the args are the inputs, the poll interval, the states and last the running job
+            *callback_args, running_id = args
+            del callback_args[n_inputs]
+
+            triggered = _triggered()
+            session = None
+            if with_session:
+                *callback_args, session = callback_args
+
+            if f"{poll_id}.n_intervals" not in triggered:
+                if limiter is not None and not limiter.admit(session, triggered):
+                    raise dash.exceptions.PreventUpdate
+
+                # new run, the result of an ongoing run is not needed anymore
+                runner.discard(running_id)
+                job = runner.submit(update, *callback_args)
+                return respond(job_id=job.id, disabled=False)
+
+            job = runner.get(running_id)
+            if job is None:
+                return respond(disabled=True)
+            if not job.done():
+                return respond(job=job)
+
+            runner.discard(running_id)
+            try:
+                results = job.future.result()
+            except dash.exceptions.PreventUpdate:
+                return respond(job=job, job_id=None, disabled=True)
+            except Exception:
+                logger.exception(f"Background callback '{name}' failed")
+                return respond(job=job, job_id=None, disabled=True)
+
+            if no_output:
+                results = dash.no_update
+            results = [results] if single_output else list(results)
+            # only the response delivering the result is counted, not the ones starting the run or polling
+            flask.g.dashy_callback = name
+            return respond(results, job=job, job_id=None, disabled=True)
+
+    def _serve_theme_css(self, filename: str):
+        # the filename is fingerprinted by the content, it can be cached forever
+        if filename != self._theme_css.name:
+            flask.abort(404)
+        response = flask.send_file(
+            self._theme_css, mimetype="text/css", max_age=31536000
+        )
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+    def _serve_metrics(self):
+        return flask.Response(
+            self.metrics.to_prometheus(),
+            mimetype="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+    def _record_response_size(self, response: flask.Response) -> flask.Response:
+        name = flask.g.get("dashy_callback")
+        if name is not None and response.status_code == 200:
+            size = response.calculate_content_length()
+            if size is None:
+                size = len(response.get_data())
+            self.metrics.record_response(name, size)
+        return response
+
+    def cache_info(self) -> dict[str, dict]:
+        """
+        Hit, miss and eviction counters for all memoized callbacks, and execution and shared counters for all
+        single flight callbacks
+
+        Returns:
+            dict with callback names as keys
+        """
+        info = {name: cache.info() for name, cache in self.callback_caches.items()}
+        for name, flight in self.single_flights.items():
+            info.setdefault(name, {}).update(flight.info())
+        return info
+
+    def _callback_name(self, func) -> str:
+        """Unique name for a callback, used when reporting e.g. cache stats"""
+        name = func.__name__
+        count = 1
+        while name in self._callback_names:
+            count += 1
+            name = f"{func.__name__}_{count}"
+        self._callback_names.add(name)
+        return name
+
+
+def _triggered() -> list[str]:
+    """Prop ids of the inputs that triggered the current callback"""
+    return [t["prop_id"] for t in dash.callback_context.triggered]
@@ -0,0 +1,120 @@
+import threading
+import uuid
+from typing import Optional
+
+import pandas as pd
+
+from dashy.cache import CallbackCache
+from dashy.filtering import DataFrameIndex
+
+
+class DatasetRegistry:
+    """
+    Data frames kept on the server and referenced from the browser by a small handle, e.g. in a dcc.Store.
+
+    Callbacks take the handle as an input or state and resolve it with 'get', so the data is never sent back and
+    forth between the browser and the server.
+
+    Pinned data frames, e.g. of tables in the layout, are kept until they are replaced. Other data frames, e.g. of
+    uploaded files, are evicted least recently used first when the registry is full, and their handles then
+    resolve to None.
+
+    Args:
+        max_entries: Max number of data frames that are not pinned
+        max_size: Max total memory in bytes of the data frames that are not pinned. Larger data frames can only be
+                  registered pinned.
+    """
+
+    def __init__(self, max_entries: int = 64, max_size: int = 2**30):
+        self._pinned: dict[str, DataFrameIndex] = {}
+        self._evictable = CallbackCache(
+            max_entries=max_entries,
+            max_size=max_size,
+            sizeof=lambda index: frame_size(index.df),
+        )
+        self._lock = threading.Lock()
+
+    def register(
+        self, df: pd.DataFrame, handle: Optional[str] = None, pin: bool = False
+    ) -> str:
+        """
+        Add a data frame.
+
+        Args:
+            df: The data frame
+            handle: Handle of the data frame, a random one is created if None. Registering a data frame with the
+                    handle of another replaces it.
+            pin: If True the data frame is never evicted
+
+        Raises:
+            ValueError: If the data frame is not pinned and larger than 'max_size'
+
+        Returns:
+            The handle
+        """
+        if handle is None:
+            handle = uuid.uuid4().hex
+
+        current = self._find(handle, count=False)
+        if current is not None and current.df is df:
+            # keep the filter and sort structures already built
+            index = current
+        else:
+            index = DataFrameIndex(df)
+
+        with self._lock:
+            if pin:
+                self._pinned[handle] = index
+                self._evictable.delete(handle)
+            elif self._evictable.set(handle, index):
+                self._pinned.pop(handle, None)
+            else:
+                raise ValueError(
+                    f"The data frame of {frame_size(df)} bytes is larger than 'max_size'"
+                    f" ({self._evictable.max_size} bytes), pin it to keep it"
+                )
+        return handle
+
+    def get(self, handle: Optional[str]) -> Optional[pd.DataFrame]:
+        """The data frame of a handle, None if there is none"""
+        index = self.index(handle)
+        return None if index is None else index.df
+
+    def index(self, handle: Optional[str]) -> Optional[DataFrameIndex]:
+        """The data frame of a handle together with its filter and sort structures, None if there is none"""
+        if handle is None:
+            return None
+        return self._find(handle)
+
+    def remove(self, handle: str) -> bool:
+        """
+        Remove a data frame.
+
+        Returns:
+            True if a data frame was removed
+        """
+        with self._lock:
+            pinned = self._pinned.pop(handle, None) is not None
+        return self._evictable.delete(handle) or pinned
+
+    def info(self) -> dict:
+        """Number of pinned data frames and counters of the others"""
+        with self._lock:
+            pinned = len(self._pinned)
+        return {"pinned": pinned, **self._evictable.info()}
+
+    def __contains__(self, handle: str) -> bool:
+        return self._find(handle, count=False) is not None
+
+    def _find(self, handle: str, count: bool = True) -> Optional[DataFrameIndex]:
+        """Look up a handle, 'count' it in the hit and miss counters if True"""
+        index = self._pinned.get(handle)
+        if index is None:
+            lookup = self._evictable.get if count else self._evictable.peek
+            index = lookup(handle)
+        return index
+
+
+def frame_size(df: pd.DataFrame) -> int:
+    """Memory used by a data frame in bytes, including the objects of e.g. text columns"""
+    return int(df.memory_usage(index=True, deep=True).sum())
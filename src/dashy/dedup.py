@@ -0,0 +1,79 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+import dash
+import dash._callback
+from dash.exceptions import PreventUpdate
+
+
+class OutputDeduplicator:
+    """
+    Replaces callback outputs that are unchanged since the last response to the same session with no_update.
+
+    The outputs are compared by a hash of their serialized value, so large figures and table data are not
+    sent again and not rendered again by the browser.
+
+    Args:
+        max_sessions: Max number of sessions to remember outputs for, the least recently active is dropped first.
+    """
+
+    def __init__(self, max_sessions: int = 10000):
+        self.max_sessions = max_sessions
+        self.suppressed = 0
+
+        self._hashes: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def filter(self, session: Optional[Hashable], outputs: Any, single: bool) -> Any:
+        """
+        Filter the outputs of a callback.
+
+        Args:
+            session: Id of the session the response is sent to. Nothing is filtered if None.
+            outputs: Value(s) returned by the callback
+            single: If the callback has a single output, otherwise 'outputs' is a list of values
+
+        Raises:
+            PreventUpdate: If none of the outputs have changed
+
+        Returns:
+            The outputs with unchanged values replaced by no_update
+        """
+        if session is None:
+            return outputs
+
+        values = [outputs] if single else list(outputs)
+        hashes = [_hash(v) for v in values]
+
+        with self._lock:
+            previous = self._hashes.get(session)
+            if previous is None or len(previous) != len(hashes):
+                previous = [None] * len(hashes)
+            # keep the last known value for outputs that are not updated
+            self._hashes[session] = [
+                prev if v is dash.no_update else h
+                for prev, h, v in zip(previous, hashes, values)
+            ]
+            self._hashes.move_to_end(session)
+            while len(self._hashes) > self.max_sessions:
+                self._hashes.popitem(last=False)
+
+        unchanged = [h is not None and h == prev for h, prev in zip(hashes, previous)]
+        if all(u or v is dash.no_update for u, v in zip(unchanged, values)):
+            self.suppressed += sum(unchanged)
+            raise PreventUpdate
+
+        self.suppressed += sum(unchanged)
+        values = [dash.no_update if u else v for u, v in zip(unchanged, values)]
+        return values[0] if single else values
+
+
+def _hash(value: Any) -> Optional[bytes]:
+    # a patch changes the current value, the same patch twice is not a no-op
+    if value is dash.no_update or isinstance(value, dash.Patch):
+        return None
+    # looked up on each call, the encoder is set by 'use_json_engine'
+    encoded = dash._callback.to_json(value)
+    return hashlib.blake2b(encoded.encode(), digest_size=16).digest()
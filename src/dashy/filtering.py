@@ -0,0 +1,465 @@
+import operator
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from dashy.cache import CallbackCache
+
+# a compiled filter, returns the boolean mask of the matching rows
+Filter = Callable[["DataFrameIndex"], np.ndarray]
+
+_COLUMN = re.compile(r"\s*\{((?:[^}\\]|\\.)+)\}")
+_OPERATOR = re.compile(
+    r"\s*([is]?)(<=|>=|!=|<|>|=|(?:eq|ne|lt|le|gt|ge|contains|datestartswith)\b)"
+)
+_UNARY = re.compile(r"\s*is\s+(not\s+)?(blank|nil|num|str|even|odd)\b")
+_VALUE = re.compile(
+    r"""\s*(?:"((?:[^"\\]|\\.)*)"|'((?:[^'\\]|\\.)*)'|`((?:[^`\\]|\\.)*)`|([^\s()&|]+))"""
+)
+_TOKEN = re.compile(r"\s*(&&|\|\||!(?!=)|\(|\))")
+
+_RELATIONAL = {
+    "=": "eq",
+    "!=": "ne",
+    "<": "lt",
+    "<=": "le",
+    ">": "gt",
+    ">=": "ge",
+}
+
+_NUMPY_OPERATORS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "le": operator.le,
+    "gt": operator.gt,
+    "ge": operator.ge,
+}
+
+
+class DataFrameIndex:
+    """
+    Lookup structures for filtering and sorting a data frame, built on first use and reused by later queries.
+
+    - Text and categorical columns are factorized once. Filters are evaluated on the distinct values only and
+      mapped to the rows by their codes.
+    - Comparisons on sorted columns are a binary search instead of a scan.
+    - Sort orders and the rows of recent queries are kept, so paging through a filtered and sorted table does
+      not filter or sort again.
+
+    Args:
+        df: The data frame
+        max_orders: Number of sort orders to keep
+        max_results: Number of query results (row positions) to keep
+    """
+
+    def __init__(self, df: pd.DataFrame, max_orders: int = 8, max_results: int = 4):
+        self.df = df
+        self.orders = CallbackCache(max_entries=max_orders)
+        self.results = CallbackCache(max_entries=max_results)
+
+        self._factorized: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._sorted: dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.df)
+
+    def query(
+        self, filter_query: Optional[str] = None, sort_by: Optional[list[dict]] = None
+    ) -> np.ndarray:
+        """
+        Positions of the rows matching a DataTable 'filter_query', in the order of a DataTable 'sort_by'.
+
+        Raises:
+            ValueError: If the filter query can not be parsed
+        """
+        sort_key = tuple((s["column_id"], s["direction"]) for s in sort_by or [])
+        key = (filter_query or "", sort_key)
+        positions = self.results.get(key)
+        if positions is None:
+            positions = self._query(filter_query, sort_key)
+            self.results.set(key, positions)
+        return positions
+
+    def _query(self, filter_query: Optional[str], sort_key: tuple) -> np.ndarray:
+        expression = compile_filter(filter_query) if filter_query else None
+        mask = None if expression is None else expression(self)
+
+        if not sort_key:
+            return np.arange(len(self.df)) if mask is None else np.flatnonzero(mask)
+
+        order = self.order(sort_key)
+        return order if mask is None else order[mask[order]]
+
+    def order(self, sort_key: tuple[tuple[str, str], ...]) -> np.ndarray:
+        """Row positions sorted by (column, 'asc' | 'desc') pairs, stable like the DataTable"""
+        order = self.orders.get(sort_key)
+        if order is None:
+            columns = [c for c, _ in sort_key if c in self.df.columns]
+            ascending = [d == "asc" for c, d in sort_key if c in self.df.columns]
+            if not columns:
+                return np.arange(len(self.df))
+            df = self.df[columns].reset_index(drop=True)
+            try:
+                df = df.sort_values(columns, ascending=ascending, kind="stable")
+            except TypeError:
+                # values of mixed types can not be compared, e.g. numbers and text
+                df = df.sort_values(
+                    columns, ascending=ascending, kind="stable", key=_sortable
+                )
+            order = df.index.to_numpy()
+            self.orders.set(sort_key, order)
+        return order
+
+    def factorized(self, column: str) -> tuple[np.ndarray, np.ndarray]:
+        """Codes of the rows, -1 for missing values, and the distinct values of a column"""
+        factorized = self._factorized.get(column)
+        if factorized is None:
+            series = self.df[column]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                factorized = (
+                    series.cat.codes.to_numpy(),
+                    series.cat.categories.to_numpy(),
+                )
+            else:
+                codes, uniques = pd.factorize(series)
+                factorized = (codes, np.asarray(uniques))
+            with self._lock:
+                self._factorized[column] = factorized
+        return factorized
+
+    def is_sorted(self, column: str) -> bool:
+        """If a column is sorted ascending, without missing values"""
+        is_sorted = self._sorted.get(column)
+        if is_sorted is None:
+            series = self.df[column]
+            is_sorted = bool(series.is_monotonic_increasing) and not series.hasnans
+            with self._lock:
+                self._sorted[column] = is_sorted
+        return is_sorted
+
+
+def _sortable(series: pd.Series) -> pd.Series:
+    """Values of mixed columns as comparable keys, numbers first, then text, then any other values as text"""
+    if series.dtype != object:
+        return series
+    return series.map(_sort_key, na_action="ignore")
+
+
+def _sort_key(value: Any) -> tuple:
+    if isinstance(value, (int, float, np.number)):
+        return (0, value)
+    if isinstance(value, str):
+        return (1, value)
+    return (2, str(value))
+
+
+@lru_cache(maxsize=256)
+def compile_filter(filter_query: str) -> Filter:
+    """
+    Compile a DataTable 'filter_query', e.g. '{price} > 10 && ({name} icontains "a" || {name} is blank)',
+    into a function returning the boolean mask of the matching rows of a DataFrameIndex.
+
+    Compiled queries are cached.
+
+    Raises:
+        ValueError: If the query can not be parsed
+    """
+    parser = _Parser(filter_query)
+    expression = parser.expression()
+    parser.end()
+    return expression
+
+
+class _Parser:
+    """Recursive descent parser of the filter query syntax, builds the filter from closures"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+
+    def expression(self) -> Filter:
+        left = self.conjunction()
+        while self.token("||"):
+            left = _or(left, self.conjunction())
+        return left
+
+    def conjunction(self) -> Filter:
+        left = self.unary()
+        while self.token("&&"):
+            left = _and(left, self.unary())
+        return left
+
+    def unary(self) -> Filter:
+        if self.token("!"):
+            return _not(self.unary())
+        if self.token("("):
+            expression = self.expression()
+            if not self.token(")"):
+                self.error("expected ')'")
+            return expression
+        return self.term()
+
+    def term(self) -> Filter:
+        column = self.match(_COLUMN)
+        if column is None:
+            self.error("expected a {column}")
+        column = re.sub(r"\\(.)", r"\1", column.group(1))
+
+        unary = self.match(_UNARY)
+        if unary is not None:
+            negate, check = unary.groups()
+            expression = _check(column, check)
+            return _not(expression) if negate else expression
+
+        relational = self.match(_OPERATOR)
+        if relational is None:
+            self.error("expected an operator")
+        case, op = relational.groups()
+        value = self.match(_VALUE)
+        if value is None:
+            self.error("expected a value")
+        return _compare(column, _RELATIONAL.get(op, op), _value(value), case == "i")
+
+    def token(self, token: str) -> bool:
+        match = _TOKEN.match(self.text, self.pos)
+        if match is None or match.group(1) != token:
+            return False
+        self.pos = match.end()
+        return True
+
+    def match(self, pattern: re.Pattern) -> Optional[re.Match]:
+        match = pattern.match(self.text, self.pos)
+        if match is not None:
+            self.pos = match.end()
+        return match
+
+    def end(self):
+        if self.text[self.pos :].strip():  # noqa: E203
+            self.error("unexpected input")
+
+    def error(self, message: str):
+        raise ValueError(f"Invalid filter query at {self.pos}, {message}: {self.text}")
+
+
+def _value(match: re.Match) -> Any:
+    """Quoted values are strings, other values numbers if possible"""
+    *quoted, bare = match.groups()
+    for value in quoted:
+        if value is not None:
+            return re.sub(r"\\(.)", r"\1", value)
+    try:
+        return float(bare)
+    except ValueError:
+        return bare
+
+
+def _and(left: Filter, right: Filter) -> Filter:
+    return lambda index: left(index) & right(index)
+
+
+def _or(left: Filter, right: Filter) -> Filter:
+    return lambda index: left(index) | right(index)
+
+
+def _not(expression: Filter) -> Filter:
+    return lambda index: ~expression(index)
+
+
+def _none(index: DataFrameIndex) -> np.ndarray:
+    return np.zeros(len(index), dtype=bool)
+
+
+def _compare(column: str, op: str, value: Any, case_insensitive: bool) -> Filter:
+    def compare(index: DataFrameIndex) -> np.ndarray:
+        if column not in index.df.columns:
+            # like the DataTable, terms on unknown columns do not filter
+            return np.ones(len(index), dtype=bool)
+
+        series = index.df[column]
+        if _is_text(series):
+            return _compare_distinct(index, column, op, value, case_insensitive)
+        is_dates = pd.api.types.is_datetime64_any_dtype(series)
+        if op in ("contains", "datestartswith") and not is_dates:
+            values = series.to_numpy().astype(str)
+            return _compare_text(values, op, value, case_insensitive)
+        if is_dates:
+            return _compare_dates(index, column, op, value)
+        is_bool = pd.api.types.is_bool_dtype(series)
+        if pd.api.types.is_numeric_dtype(series) and not is_bool:
+            if isinstance(value, str):
+                # text never equals a number
+                return np.full(len(index), op == "ne")
+            return _compare_sorted(index, column, op, value)
+        # e.g. mixed columns, values of other types do not match
+        return _compare_scalars(series.to_numpy(), op, value, case_insensitive)
+
+    return compare
+
+
+def _is_text(series: pd.Series) -> bool:
+    return isinstance(
+        series.dtype, pd.CategoricalDtype
+    ) or pd.api.types.is_string_dtype(series)
+
+
+def _compare_distinct(
+    index: DataFrameIndex, column: str, op: str, value: Any, case_insensitive: bool
+) -> np.ndarray:
+    """Evaluate on the distinct values and map the result to the rows by their codes"""
+    codes, uniques = index.factorized(column)
+    if op in ("contains", "datestartswith"):
+        matches = _compare_text(uniques.astype(str), op, value, case_insensitive)
+    else:
+        if not isinstance(value, str) and uniques.dtype.kind in "OUS":
+            # numbers typed into a text column are compared as typed, e.g. '5' and not '5.0'
+            value = _text(value)
+        matches = _compare_scalars(uniques, op, value, case_insensitive)
+    # missing values (code -1) take the appended False
+    return np.append(matches, op == "ne")[codes]
+
+
+def _compare_scalars(
+    values: np.ndarray, op: str, value: Any, case_insensitive: bool
+) -> np.ndarray:
+    if case_insensitive and isinstance(value, str):
+        values = np.char.lower(values.astype(str))
+        value = value.lower()
+    compare = _NUMPY_OPERATORS[op]
+    try:
+        return np.asarray(compare(values, value), dtype=bool)
+    except TypeError:
+        # mixed types, compare one by one and treat incomparable values as no match
+        return np.fromiter(
+            (_safe_compare(compare, v, value) for v in values),
+            dtype=bool,
+            count=len(values),
+        )
+
+
+def _safe_compare(compare: Callable, left: Any, right: Any) -> bool:
+    try:
+        return bool(compare(left, right))
+    except TypeError:
+        return False
+
+
+def _compare_text(
+    values: np.ndarray, op: str, value: Any, case_insensitive: bool
+) -> np.ndarray:
+    value = _text(value)
+    if case_insensitive:
+        values = np.char.lower(values)
+        value = value.lower()
+    if op == "contains":
+        return np.char.find(values, value) >= 0
+    return np.char.startswith(values, value)
+
+
+def _compare_sorted(
+    index: DataFrameIndex, column: str, op: str, value: float
+) -> np.ndarray:
+    """Numeric comparison, a binary search if the column is sorted"""
+    values = index.df[column].to_numpy()
+    if op == "ne" or not index.is_sorted(column):
+        return _NUMPY_OPERATORS[op](values, value)
+
+    start, stop = 0, len(values)
+    if op in ("gt", "ge", "eq"):
+        start = np.searchsorted(values, value, side="right" if op == "gt" else "left")
+    if op in ("lt", "le", "eq"):
+        stop = np.searchsorted(
+            values, value, side="right" if op in ("le", "eq") else "left"
+        )
+
+    mask = np.zeros(len(values), dtype=bool)
+    mask[start:stop] = True
+    return mask
+
+
+def _compare_dates(
+    index: DataFrameIndex, column: str, op: str, value: Any
+) -> np.ndarray:
+    """Dates compare to the period written, e.g. '2021-03' is the whole month of March 2021"""
+    series = index.df[column]
+    if op == "contains":
+        return _compare_text(series.to_numpy().astype(str), op, value, False)
+
+    try:
+        period = pd.Period(_text(value))
+    except ValueError:
+        return _none(index)
+
+    start, end = period.start_time, period.end_time
+    if series.dt.tz is not None:
+        # compare in naive UTC, the period is in the time zone of the column
+        start = start.tz_localize(series.dt.tz).tz_convert("UTC").tz_localize(None)
+        end = end.tz_localize(series.dt.tz).tz_convert("UTC").tz_localize(None)
+        series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+    values = series.to_numpy()
+    start, end = start.to_datetime64(), end.to_datetime64()
+
+    if op in ("eq", "ne", "datestartswith"):
+        within = (values >= start) & (values <= end)
+        return ~within if op == "ne" else within
+    if op in ("lt", "ge"):
+        return _NUMPY_OPERATORS[op](values, start)
+    return _NUMPY_OPERATORS[op](values, end)
+
+
+def _text(value: Any) -> str:
+    """Values as typed, e.g. 5 and not 5.0"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _check(column: str, check: str) -> Filter:
+    def is_(index: DataFrameIndex) -> np.ndarray:
+        if column not in index.df.columns:
+            return np.ones(len(index), dtype=bool)
+
+        series = index.df[column]
+        if check in ("blank", "nil"):
+            if not _is_text(series):
+                return series.isna().to_numpy()
+            codes, uniques = index.factorized(column)
+            blank = np.zeros(len(uniques), dtype=bool)
+            if check == "blank":
+                blank = np.char.strip(uniques.astype(str)) == ""
+            # missing values (code -1) take the appended True
+            return np.append(blank, True)[codes]
+        if check in ("num", "str"):
+            return _check_type(index, column, check)
+        if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(
+            series
+        ):
+            return _none(index)
+        remainder = (series % 2).to_numpy()
+        return remainder == (0 if check == "even" else 1)
+
+    return is_
+
+
+def _check_type(index: DataFrameIndex, column: str, check: str) -> np.ndarray:
+    series = index.df[column]
+    if _is_text(series) or series.dtype == object:
+        # the types of mixed columns are checked value by value
+        codes, uniques = index.factorized(column)
+        types = (str,) if check == "str" else (int, float, np.number)
+        matches = np.fromiter(
+            (isinstance(v, types) for v in uniques), dtype=bool, count=len(uniques)
+        )
+        return np.append(matches, False)[codes]
+    if (
+        check == "num"
+        and pd.api.types.is_numeric_dtype(series)
+        and not pd.api.types.is_bool_dtype(series)
+    ):
+        return series.notna().to_numpy()
+    return _none(index)
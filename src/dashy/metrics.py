@@ -0,0 +1,148 @@
+import threading
+import time
+from collections import deque
+from functools import wraps
+from typing import Callable, Iterable
+
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class CallbackStats:
+    """
+    Call, exception and latency statistics for a single callback.
+
+    Latency quantiles are computed from a window of the latest 'window' calls.
+    """
+
+    def __init__(self, window: int = 1024):
+        self.calls = 0
+        self.exceptions = 0
+        self.latency_sum = 0.0
+        self.response_bytes = 0
+        self.responses = 0
+        self.latencies: deque = deque(maxlen=window)
+
+    def quantiles(self, quantiles: Iterable[float] = QUANTILES) -> dict[float, float]:
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return {q: float("nan") for q in quantiles}
+        return {
+            q: latencies[min(int(q * len(latencies)), len(latencies) - 1)]
+            for q in quantiles
+        }
+
+
+class CallbackMetrics:
+    """Latency, exception and payload size metrics for all callbacks of an app"""
+
+    def __init__(self, window: int = 1024):
+        self.window = window
+        self.callbacks: dict[str, CallbackStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, name: str) -> CallbackStats:
+        stats = self.callbacks.get(name)
+        if stats is None:
+            stats = self.callbacks.setdefault(name, CallbackStats(self.window))
+        return stats
+
+    def record_call(self, name: str, latency: float, exception: bool = False):
+        with self._lock:
+            stats = self._stats(name)
+            stats.calls += 1
+            stats.exceptions += int(exception)
+            stats.latency_sum += latency
+            stats.latencies.append(latency)
+
+    def record_response(self, name: str, size: int):
+        with self._lock:
+            stats = self._stats(name)
+            stats.responses += 1
+            stats.response_bytes += size
+
+    def wrap(self, name: str, func: Callable, ignore: tuple = ()) -> Callable:
+        """
+        Wrap 'func' and record the latency and raised exceptions of each call.
+
+        Args:
+            name: Name of the callback
+            func: The callback function
+            ignore: Exception types that are not counted as exceptions, e.g. PreventUpdate
+        """
+
+        @wraps(func)
+        def measured(*args, **kwargs):
+            start = time.perf_counter()
+            failed = False
+            try:
+                return func(*args, **kwargs)
+            except ignore:
+                raise
+            except Exception:
+                failed = True
+                raise
+            finally:
+                self.record_call(name, time.perf_counter() - start, exception=failed)
+
+        return measured
+
+    def to_prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format"""
+        with self._lock:
+            snapshot = {
+                name: (
+                    stats.calls,
+                    stats.exceptions,
+                    stats.latency_sum,
+                    stats.quantiles(),
+                    stats.responses,
+                    stats.response_bytes,
+                )
+                for name, stats in self.callbacks.items()
+            }
+
+        lines = [
+            "# HELP dashy_callback_latency_seconds Callback execution time in seconds.",
+            "# TYPE dashy_callback_latency_seconds summary",
+        ]
+        for name, (calls, _, latency_sum, quantiles, _, _) in snapshot.items():
+            label = _label(name)
+            for q, value in quantiles.items():
+                lines.append(
+                    f'dashy_callback_latency_seconds{{callback="{label}",quantile="{q}"}} {value}'
+                )
+            lines.append(
+                f'dashy_callback_latency_seconds_sum{{callback="{label}"}} {latency_sum}'
+            )
+            lines.append(
+                f'dashy_callback_latency_seconds_count{{callback="{label}"}} {calls}'
+            )
+
+        lines += [
+            "# HELP dashy_callback_exceptions_total Exceptions raised by callbacks.",
+            "# TYPE dashy_callback_exceptions_total counter",
+        ]
+        for name, (_, exceptions, _, _, _, _) in snapshot.items():
+            lines.append(
+                f'dashy_callback_exceptions_total{{callback="{_label(name)}"}} {exceptions}'
+            )
+
+        lines += [
+            "# HELP dashy_callback_response_bytes Size of serialized callback responses in bytes.",
+            "# TYPE dashy_callback_response_bytes summary",
+        ]
+        for name, (_, _, _, _, responses, response_bytes) in snapshot.items():
+            label = _label(name)
+            lines.append(
+                f'dashy_callback_response_bytes_sum{{callback="{label}"}} {response_bytes}'
+            )
+            lines.append(
+                f'dashy_callback_response_bytes_count{{callback="{label}"}} {responses}'
+            )
+
+        return "\n".join(lines) + "\n"
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,75 @@
+from typing import Any, Optional
+
+from dash import Patch
+
+
+def figure_patch(
+    append_traces: Optional[list] = None,
+    extend_traces: Optional[dict[int, dict[str, list]]] = None,
+    layout: Optional[dict[str, Any]] = None,
+) -> Patch:
+    """
+    Partial update of a figure. Return it from a callback with a 'figure' output instead of a whole new figure,
+    only the changes are then sent to the browser.
+
+    Args:
+        append_traces: Traces to add to the figure, plotly trace objects or dicts
+        extend_traces: Points to add to existing traces. Maps trace index to the values to add for each
+                       attribute, e.g. {0: {"x": [4, 5], "y": [1, 2]}}
+        layout: Layout keys to update, nested keys are separated by dots, e.g. {"title.text": "New title"}
+
+    Returns:
+        Patch to be returned as the figure
+    """
+    patch = Patch()
+
+    for trace in append_traces or []:
+        if hasattr(trace, "to_plotly_json"):
+            trace = trace.to_plotly_json()
+        patch["data"].append(trace)
+
+    for index, points in (extend_traces or {}).items():
+        for attribute, values in points.items():
+            patch["data"][index][attribute].extend(list(values))
+
+    for key, value in (layout or {}).items():
+        target = patch["layout"]
+        *parents, last = key.split(".")
+        for parent in parents:
+            target = target[parent]
+        target[last] = value
+
+    return patch
+
+
+def table_patch(
+    append_rows: Optional[list[dict]] = None,
+    update_rows: Optional[dict[int, dict[str, Any]]] = None,
+    delete_rows: Optional[list[int]] = None,
+) -> Patch:
+    """
+    Partial update of table data. Return it from a callback with a table 'data' output instead of all records,
+    only the changed rows are then sent to the browser.
+
+    Args:
+        append_rows: Records to add at the end of the table
+        update_rows: Maps row index to the column values to change, e.g. {3: {"price": 10.5}}
+        delete_rows: Indices of the rows to remove. Applied last, indices refer to the rows before appending.
+
+    Returns:
+        Patch to be returned as the table data
+    """
+    patch = Patch()
+
+    for index, values in (update_rows or {}).items():
+        for column, value in values.items():
+            patch[index][column] = value
+
+    for row in append_rows or []:
+        patch.append(row)
+
+    # delete from the end so the indices stay valid
+    for index in sorted(delete_rows or [], reverse=True):
+        del patch[index]
+
+    return patch
@@ -0,0 +1,123 @@
+import itertools
+import threading
+import time
+from typing import Hashable, Iterable, Optional
+
+
+class RateLimiter:
+    """
+    Server-side debounce and throttle of callback executions, per session and triggering input.
+
+    Debounce: An execution waits 'debounce' seconds and is dropped if a newer one arrived meanwhile, so a burst of
+    events only runs the callback once with the last value.
+
+    Throttle: The callback runs at most once every 'throttle' seconds. An execution arriving too soon waits for the
+    interval to pass and is dropped if a newer one arrived meanwhile, so the last value is always run.
+
+    Args:
+        debounce: Debounce time in seconds, by input prop id ('id.property')
+        throttle: Throttle interval in seconds, by input prop id ('id.property')
+        max_sessions: Number of sessions to remember the last run for before old ones are dropped
+    """
+
+    def __init__(
+        self,
+        debounce: Optional[dict[str, float]] = None,
+        throttle: Optional[dict[str, float]] = None,
+        max_sessions: int = 10000,
+    ):
+        self.debounce = debounce or {}
+        self.throttle = throttle or {}
+        self.max_sessions = max_sessions
+        self.dropped = 0
+
+        # tickets only ever increase, so a ticket is never issued twice
+        self._tickets = itertools.count(1)
+        self._latest: dict[Hashable, int] = {}
+        self._waiting: dict[Hashable, int] = {}
+        self._last_run: dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+
+    def admit(self, session: Optional[Hashable], triggered: Iterable[str]) -> bool:
+        """
+        Wait as needed and decide if an execution should run.
+
+        Args:
+            session: Id of the session, executions are not limited if None
+            triggered: Prop ids of the inputs that triggered the execution
+
+        Returns:
+            True if the execution should run, False if it is superseded by a newer one
+        """
+        triggered = list(triggered)
+        debounce = max((self.debounce.get(t, 0) for t in triggered), default=0)
+        throttle = max((self.throttle.get(t, 0) for t in triggered), default=0)
+        if session is None or (debounce <= 0 and throttle <= 0):
+            return True
+
+        with self._lock:
+            ticket = next(self._tickets)
+            self._latest[session] = ticket
+            self._waiting[session] = self._waiting.get(session, 0) + 1
+            last_run = self._last_run.get(session)
+
+        try:
+            wait = debounce
+            if throttle > 0 and last_run is not None:
+                wait = max(wait, last_run + throttle - time.monotonic())
+            if wait > 0:
+                time.sleep(wait)
+        finally:
+            with self._lock:
+                self._waiting[session] -= 1
+                if not self._waiting[session]:
+                    del self._waiting[session]
+
+        with self._lock:
+            if self._latest.get(session) != ticket:
+                self.dropped += 1
+                return False
+            now = time.monotonic()
+            self._last_run[session] = now
+            if len(self._last_run) > self.max_sessions:
+                self._prune(now)
+            return True
+
+    def _prune(self, now: float):
+        """Drop sessions that can not be throttled anymore and have no executions waiting"""
+        horizon = now - max(self.throttle.values(), default=0)
+        self._last_run = {s: t for s, t in self._last_run.items() if t > horizon}
+        self._latest = {
+            s: ticket
+            for s, ticket in self._latest.items()
+            if s in self._last_run or s in self._waiting
+        }
+
+
+def to_seconds(value, input_ids: list[str], name: str) -> dict[str, float]:
+    """
+    Normalize a debounce/throttle argument to seconds by input prop id.
+
+    Args:
+        value: Milliseconds for all inputs, or a dict of milliseconds by (id, property) input tuples
+        input_ids: Prop ids of the callback inputs
+        name: Name of the argument, used in error messages
+    """
+    if value is None:
+        return {}
+    if isinstance(value, (int, float)):
+        return {i: value / 1000 for i in input_ids}
+    if not isinstance(value, dict):
+        raise ValueError(
+            f"'{name}' must be milliseconds or a dict, was: {type(value)}"
+        )
+
+    seconds = {}
+    for key, ms in value.items():
+        if not isinstance(key, tuple) or len(key) != 2:
+            raise ValueError(f"'{name}' keys must be (id, property) tuples")
+        prop_id = f"{key[0]}.{key[1]}"
+        if prop_id not in input_ids:
+            raise ValueError(f"'{name}' input {key} is not an input of the callback")
+        seconds[prop_id] = ms / 1000
+    return seconds
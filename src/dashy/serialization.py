@@ -0,0 +1,179 @@
+import datetime
+import decimal
+from typing import Any, Callable, Optional, Union
+
+import dash._callback
+import dash._utils
+import dash.dash
+import plotly.io.json
+from plotly.io.json import to_json_plotly
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+JSON_ENGINES = ("auto", "orjson", "plotly")
+
+_ORJSON_OPTIONS = (
+    orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+)
+
+
+def to_json_orjson(value: Any) -> str:
+    """
+    Serialize callback responses and layouts with orjson.
+
+    Numpy arrays, datetimes, pandas objects, figures and components are encoded natively by orjson or converted on
+    the fly, instead of first walking the whole object in Python. Falls back to the plotly encoder for anything
+    orjson can not handle.
+    """
+    try:
+        return orjson.dumps(value, default=_default, option=_ORJSON_OPTIONS).decode()
+    except TypeError:
+        return to_json_plotly(value)
+
+
+def _default(obj: Any) -> Any:
+    if hasattr(obj, "to_plotly_json"):
+        return obj.to_plotly_json()
+    if np is not None and isinstance(obj, (np.ndarray, np.generic)):
+        return _default_numpy(obj)
+    if pd is not None and isinstance(
+        obj, (type(pd.NaT), type(pd.NA), pd.Timestamp, pd.Series, pd.Index, pd.DataFrame)
+    ):
+        return _default_pandas(obj)
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _default_numpy(obj: Any) -> Any:
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if obj.dtype.kind == "M":
+        return np.datetime_as_string(obj).tolist()
+    # e.g. non-contiguous arrays or object dtypes
+    return obj.tolist()
+
+
+def _default_pandas(obj: Any) -> Any:
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict("records")
+    return obj.to_numpy()
+
+
+def use_json_engine(engine: Union[str, Callable[[Any], str]] = "auto"):
+    """
+    Set the JSON encoder Dash uses for callback responses and layouts.
+
+    Dash serializes with plotly's encoder, so "orjson" and "plotly" set the engine of plotly's encoder through
+    'plotly.io.json.config.default_engine'. The engine applies to all apps and figures in the process.
+
+    A custom function is set as Dash's encoder instead. Dash has no setting for that, so this replaces its module
+    level encoder functions, which are internal to Dash. 'to_json_orjson' is a faster encoder that can be passed.
+
+    Args:
+        engine: "orjson" for plotly's orjson engine, "plotly" for plotly's json engine or "auto" for
+                "orjson" if the orjson package is installed. A function taking a value and returning a JSON
+                string can also be passed.
+    """
+    if callable(engine):
+        _set_dash_encoder(engine)
+        return
+    if engine not in JSON_ENGINES:
+        raise ValueError(f"'engine' must be one of {JSON_ENGINES} or a function")
+    if engine == "orjson" and orjson is None:
+        raise ImportError("The 'orjson' engine requires the orjson package")
+
+    use_orjson = engine == "orjson" or (engine == "auto" and orjson is not None)
+    plotly.io.json.config.default_engine = "orjson" if use_orjson else "json"
+    # undo a custom encoder set before
+    _set_dash_encoder(dash._utils.to_json)
+
+
+def _set_dash_encoder(encoder: Callable[[Any], str]):
+    if dash._callback.to_json is not encoder:
+        dash._callback.to_json = encoder
+        dash.dash.to_json = encoder
+
+
+def encode_columns(df: "pd.DataFrame", float_precision: Optional[int] = None) -> dict:
+    """
+    Compact, columnar encoding of a data frame for the browser, decoded by a clientside callback.
+
+    Column names are sent once instead of in every record and numeric columns are kept as numpy arrays, which
+    the orjson engine serializes without creating a Python object per value:
+
+    - Floats are rounded to 'float_precision' decimals, if passed. Missing values are sent as null.
+    - Text and categorical columns with repeated values are sent as distinct values and codes into them.
+    - Dates are sent as milliseconds since the epoch.
+
+    Args:
+        df: The data frame
+        float_precision: Number of decimals to round floats to. If None floats are not rounded.
+
+    Returns:
+        {"length": number of rows, "columns": {column: encoded values}}
+    """
+    return {
+        "length": len(df),
+        "columns": {
+            str(name): _encode_column(series, float_precision)
+            for name, series in df.items()
+        },
+    }
+
+
+def _encode_column(series: "pd.Series", float_precision: Optional[int]) -> Any:
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "iub":
+        return series.to_numpy()
+    if isinstance(dtype, np.dtype) and dtype.kind == "f":
+        values = series.to_numpy()
+        return values if float_precision is None else np.round(values, float_precision)
+    if isinstance(dtype, np.dtype) and dtype.kind == "M":
+        milliseconds = series.to_numpy().astype("datetime64[ms]").astype(np.int64)
+        missing = series.isna().to_numpy()
+        if missing.any():
+            # NaN is serialized as null
+            milliseconds = milliseconds.astype(np.float64)
+            milliseconds[missing] = np.nan
+        return {"dates": milliseconds}
+
+    # text, categorical and anything else, e.g. time zone aware dates or nullable integers
+    codes, uniques = pd.factorize(series)
+    if len(uniques) > len(series) // 2:
+        return series.astype(object).where(series.notna(), None).tolist()
+    return {
+        # signed, missing values are -1 even if there are no categories
+        "codes": codes.astype(np.min_scalar_type(-max(len(uniques), 1))),
+        "categories": [_category(v) for v in uniques],
+    }
+
+
+def _category(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    try:
+        return _default(value)
+    except TypeError:
+        return str(value)
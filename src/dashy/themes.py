@@ -1,9 +1,22 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional
+
+import plotly.graph_objs as go
+import plotly.io as pio
 import sass
 
+from dashy.config import CACHE_DIR
 from dashy.utils import PROJECT_ROOT
 
 
 class Theme:
+    """
+    Colors of a Dashy app. A theme is compiled once into a plotly template, used as the default for all figures,
+    and a CSS bundle.
+    """
+
     def __init__(self):
 
         self.main_color = None
@@ -15,11 +28,48 @@ class Theme:
         self.white = "#FFFFFF"
         self.black = "#000000"
 
-    def compile(self):
+    @property
+    def template_name(self) -> str:
+        return f"dashy_{type(self).__name__.lower()}"
+
+    def template(self) -> go.layout.Template:
+        """Plotly template with the theme colors"""
+        axis = dict(zerolinecolor=self.background_color, gridcolor=self.background_color)
+        return go.layout.Template(
+            layout=dict(
+                paper_bgcolor=self.white,
+                plot_bgcolor=self.white,
+                font=dict(color=self.black),
+                xaxis=axis,
+                yaxis=axis,
+                margin=dict(l=40, r=40, b=40, t=70, pad=0),
+                title=dict(x=0.5, y=1.0, pad=dict(t=30), font=dict(size=18)),
+            )
+        )
+
+    def register(self, default: bool = True) -> str:
+        """
+        Register the theme's plotly template, it is only created the first time.
+
+        Args:
+            default: If True the template is made the default for all figures, on top of the plotly template.
+
+        Returns:
+            Name of the template
+        """
+        name = self.template_name
+        if name not in pio.templates:
+            pio.templates[name] = self.template()
+        if default:
+            pio.templates.default = f"plotly+{name}"
+        return name
+
+    def scss(self) -> str:
+        """SCSS source of the theme, the theme variables followed by 'main.scss'"""
         with open(str(PROJECT_ROOT / "assets" / "main.scss"), "r") as f:
             sass_src = f.read()
 
-        sass_src = (
+        return (
             f"$main_color: {self.main_color};\n"
             f"$background_color: {self.background_color};\n"
             f"$container_background_color: {self.container_background};\n"
@@ -27,8 +77,31 @@ class Theme:
             f"$font_color: {self.font_color};\n" + sass_src
         )
 
-        with open(str(PROJECT_ROOT / "assets" / "main.css"), "w") as f:
-            f.write(sass.compile(string=sass_src))
+    def compile(self, cache_dir: Optional[Path] = None) -> Path:
+        """
+        Compile the CSS of the theme.
+
+        The file is named by a hash of the theme variables and the SCSS source and kept in the cache directory,
+        so sass only runs when something has changed.
+
+        Args:
+            cache_dir: Directory for the compiled CSS. Defaults to CACHE_DIR.
+
+        Returns:
+            Path to the compiled, fingerprinted, CSS file
+        """
+        sass_src = self.scss()
+        digest = hashlib.sha256(sass_src.encode()).hexdigest()[:16]
+
+        path = Path(cache_dir or CACHE_DIR) / f"main.{digest}.css"
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # write to a temporary file first so other processes never read a partial file
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(sass.compile(string=sass_src))
+            os.replace(tmp_path, path)
+
+        return path
 
 
 class StandardTheme(Theme):